@@ -0,0 +1,63 @@
+# File: benchmarks/bench_co_listen_graph.py
+
+"""
+Update and query throughput of CoListenGraph on a synthetic play log.
+Usage: python benchmarks/bench_co_listen_graph.py [transitions] [songs] [batch]
+e.g.   python benchmarks/bench_co_listen_graph.py 20000000 1000000 100000
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+
+from specialized.co_listen_graph import CoListenGraph
+
+
+def play_log(count, num_songs, seed=9):
+    # Listeners mostly follow a song with one of a few "natural" successors
+    rng = random.Random(seed)
+    current = 0
+    for _ in range(count):
+        if rng.random() < 0.7:
+            current = (current * 31 + rng.randrange(4)) % num_songs
+        else:
+            current = int(num_songs * rng.random() ** 2)
+        yield str(current)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    num_songs = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    batch = int(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+    graph = CoListenGraph(max_neighbors=16, max_edges=num_songs * 16)
+    log = play_log(count, num_songs)
+
+    start = time.perf_counter()
+    ingested = 0
+    while ingested < count:
+        size = min(batch, count - ingested)
+        graph.ingest(next(log) for _ in range(size))
+        ingested += size
+    elapsed = time.perf_counter() - start
+    print(f"ingest {count:,} transitions: {elapsed:.2f}s ({count / elapsed:,.0f}/s), "
+          f"{graph.edge_count:,} edges kept")
+
+    queries = [str(i) for i in range(0, num_songs, max(1, num_songs // 100_000))]
+    start = time.perf_counter()
+    for song_id in queries:
+        graph.next_song(song_id)
+    elapsed = time.perf_counter() - start
+    print(f"next_song: {elapsed / len(queries) * 1e9:,.0f} ns/query")
+
+    start = time.perf_counter()
+    for song_id in queries:
+        graph.similar_songs(song_id, 10)
+    elapsed = time.perf_counter() - start
+    print(f"similar_songs(k=10): {elapsed / len(queries) * 1e6:,.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
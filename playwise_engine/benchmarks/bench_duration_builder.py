@@ -0,0 +1,60 @@
+# File: benchmarks/bench_duration_builder.py
+
+"""
+Quality versus runtime of DurationPlaylistBuilder.
+Quality is reported against the fractional-knapsack upper bound (no subset can beat it).
+Usage: python benchmarks/bench_duration_builder.py [candidates] [target_seconds] [tolerance]
+e.g.   python benchmarks/bench_duration_builder.py 100000 3600 30
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+
+from models.song import Song
+from specialized.duration_playlist_builder import DurationPlaylistBuilder
+
+
+def upper_bound(songs, scores, high):
+    bound, room = 0.0, high
+    for song in sorted(songs, key=lambda s: scores[s.song_id] / s.duration, reverse=True):
+        if room <= 0:
+            break
+        take = min(1.0, room / song.duration)
+        bound += take * scores[song.song_id]
+        room -= take * song.duration
+    return bound
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    target = int(sys.argv[2]) if len(sys.argv) > 2 else 3600
+    tolerance = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+    rng = random.Random(11)
+    songs = [Song(str(i), f"Song{i}", f"Artist{i % 500}", rng.randint(90, 480)) for i in range(size)]
+    scores = {s.song_id: rng.randint(1, 5) + rng.random() for s in songs}
+    score_fn = lambda s: scores[s.song_id]
+    bound = upper_bound(songs, scores, target + tolerance)
+    print(f"{size:,} candidates, target {target}s +/- {tolerance}s, score bound {bound:.2f}")
+
+    configs = [
+        ("greedy + local search", DurationPlaylistBuilder(score_fn, dp_budget=0)),
+        ("dp, 64 cells", DurationPlaylistBuilder(score_fn, max_cells=64)),
+        ("dp, 256 cells", DurationPlaylistBuilder(score_fn, max_cells=256)),
+        ("dp, 1024 cells", DurationPlaylistBuilder(score_fn, max_cells=1024, dp_budget=10**8)),
+    ]
+    for label, builder in configs:
+        start = time.perf_counter()
+        chosen = builder.select(songs, target, tolerance)
+        elapsed = time.perf_counter() - start
+        total = sum(s.duration for s in chosen)
+        score = sum(scores[s.song_id] for s in chosen)
+        print(f"  {label:<22} [{builder.last_method}] {elapsed * 1e3:7.1f} ms  "
+              f"{len(chosen)} songs, {total}s, score {score:.2f} ({score / bound:.2%} of bound)")
+
+
+if __name__ == "__main__":
+    main()
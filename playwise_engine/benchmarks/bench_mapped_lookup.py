@@ -0,0 +1,89 @@
+# File: benchmarks/bench_mapped_lookup.py
+
+"""
+Lookup latency and resident memory: InstantSongLookup (dicts) versus MappedSongLookup (mmap).
+Each variant runs in its own process so RSS numbers don't mix.
+Usage: python benchmarks/bench_mapped_lookup.py [songs] [lookups] [index_path]
+e.g.   python benchmarks/bench_mapped_lookup.py 50000000 100000 /data/catalog.idx
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import tempfile
+import time
+from multiprocessing import Process
+
+from models.song import Song
+from core.instant_lookup import InstantSongLookup
+from core.mapped_song_lookup import MappedSongLookup, build_catalog_index
+
+
+def rss_mib():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def catalog(size):
+    return (Song(str(i), f"Song Title {i}", f"Artist {i % 100000}", 120 + i % 400) for i in range(size))
+
+
+def probe(label, lookup, size, lookups, base_rss):
+    rng = random.Random(1)
+    ids = [str(rng.randrange(size)) for _ in range(lookups)]
+    titles = [f"song title {rng.randrange(size)}" for _ in range(lookups)]
+    start = time.perf_counter()
+    for song_id in ids:
+        lookup.get_by_id(song_id)
+    by_id = (time.perf_counter() - start) / lookups * 1e6
+    start = time.perf_counter()
+    for title in titles:
+        lookup.get_by_title(title)
+    by_title = (time.perf_counter() - start) / lookups * 1e6
+    print(f"  {label}: get_by_id {by_id:.2f} us, get_by_title {by_title:.2f} us, "
+          f"RSS +{rss_mib() - base_rss:,.1f} MiB")
+
+
+def run_dict(size, lookups):
+    base = rss_mib()
+    lookup = InstantSongLookup()
+    for song in catalog(size):
+        lookup.add_song(song)
+    probe("InstantSongLookup (dicts)", lookup, size, lookups, base)
+
+
+def run_mapped(path, size, lookups, cache_size):
+    base = rss_mib()
+    with MappedSongLookup(path, cache_size=cache_size) as lookup:
+        probe(f"MappedSongLookup (cache={cache_size})", lookup, size, lookups, base)
+
+
+def run(target, *args):
+    worker = Process(target=target, args=args)
+    worker.start()
+    worker.join()
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    path = sys.argv[3] if len(sys.argv) > 3 else os.path.join(tempfile.gettempdir(), "playwise_catalog.idx")
+
+    start = time.perf_counter()
+    build_catalog_index(catalog(size), path, count=size)
+    print(f"{size:,} songs: index built in {time.perf_counter() - start:.1f}s, "
+          f"{os.path.getsize(path) / 2**20:,.1f} MiB on disk")
+    if size <= 10_000_000:
+        run(run_dict, size, lookups)
+    else:
+        print("  InstantSongLookup skipped (catalog too large for an in-memory dict run)")
+    run(run_mapped, path, size, lookups, 0)
+    run(run_mapped, path, size, lookups, 4096)
+    if len(sys.argv) <= 3:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
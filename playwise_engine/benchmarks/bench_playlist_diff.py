@@ -0,0 +1,80 @@
+# File: benchmarks/bench_playlist_diff.py
+
+"""
+Diff + in-place patch versus full rebuild for two playlist versions.
+Usage: python benchmarks/bench_playlist_diff.py [songs] [change_fraction]
+e.g.   python benchmarks/bench_playlist_diff.py 200000 0.01
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+
+from models.song import Song
+from core.playlist_engine import PlaylistEngine
+from core.playlist_diff import diff_playlists, apply_patch, three_way_merge
+
+
+def make_playlist(songs):
+    playlist = PlaylistEngine()
+    for song in songs:
+        playlist.append_song(song)
+    return playlist
+
+
+def mutate(songs, changes, rng, next_id):
+    songs = list(songs)
+    for _ in range(changes):
+        roll = rng.random()
+        if roll < 0.33 and songs:
+            songs.pop(rng.randrange(len(songs)))
+        elif roll < 0.66:
+            songs.insert(rng.randrange(len(songs) + 1),
+                         Song(f"new{next_id}", f"New{next_id}", "Artist", 200))
+            next_id += 1
+        else:
+            song = songs.pop(rng.randrange(len(songs)))
+            songs.insert(rng.randrange(len(songs) + 1), song)
+    return songs, next_id
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"  {label}: {(time.perf_counter() - start) * 1e3:,.1f} ms")
+    return result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    rng = random.Random(3)
+    base = [Song(str(i), f"Song{i}", f"Artist{i % 100}", 180) for i in range(size)]
+    changes = int(size * fraction)
+    ours, next_id = mutate(base, changes, rng, 0)
+    theirs, _ = mutate(base, changes, rng, next_id)
+    print(f"{size:,} songs, {changes:,} random edits per version")
+
+    old, new = make_playlist(base), make_playlist(ours)
+    script = timed("diff", lambda: diff_playlists(old, new))
+    print(f"  edit script: {len(script):,} operations")
+    timed("apply patch in place", lambda: apply_patch(old, script))
+    assert [s.song_id for s in old.display_playlist()] == [s.song_id for s in ours]
+
+    def rebuild():
+        target = PlaylistEngine()
+        for song in new.display_playlist():
+            target.append_song(song)
+        return target
+    timed("full rebuild (clear + append, no duplicate scan)", rebuild)
+
+    merged, conflicts = timed("three-way merge", lambda: three_way_merge(
+        make_playlist(base), make_playlist(ours), make_playlist(theirs)))
+    print(f"  merged {len(merged):,} songs, {len(conflicts)} conflicts")
+
+
+if __name__ == "__main__":
+    main()
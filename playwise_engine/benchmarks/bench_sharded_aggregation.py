@@ -0,0 +1,71 @@
+# File: benchmarks/bench_sharded_aggregation.py
+
+"""
+Scaling benchmark for ShardedListenAggregator on a synthetic listen-event log.
+Usage: python benchmarks/bench_sharded_aggregation.py [events] [songs] [max_workers]
+e.g.   python benchmarks/bench_sharded_aggregation.py 50000000 1000000 8
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+from array import array
+
+from models.song import Song
+from specialized.favorite_sorted_queue import FavoriteSortedQueue
+from specialized.sharded_listen_aggregator import ShardedListenAggregator
+
+
+def build_log(num_events, num_songs, seed=42):
+    rng = random.Random(seed)
+    # Skewed popularity: squaring a uniform draw favours low song indices
+    indices = array("I", (int(num_songs * rng.random() ** 2) for _ in range(num_events)))
+    seconds = array("I", (rng.randint(30, 300) for _ in range(num_events)))
+    return indices, seconds
+
+
+def main():
+    num_events = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    num_songs = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    songs = [Song(str(i), f"Song{i}", f"Artist{i % 1000}", 180) for i in range(num_songs)]
+
+    print(f"Generating {num_events:,} events over {num_songs:,} songs...")
+    indices, seconds = build_log(num_events, num_songs)
+
+    baseline = None
+    if num_events <= 5_000_000:
+        queue = FavoriteSortedQueue()
+        start = time.perf_counter()
+        for idx, secs in zip(indices, seconds):
+            queue.add_listen_time(songs[idx], secs)
+        queue.get_top_k_songs(10)
+        baseline = time.perf_counter() - start
+        print(f"FavoriteSortedQueue (reference): {baseline:.2f}s "
+              f"({num_events / baseline:,.0f} events/s)")
+
+    workers = 1
+    while workers <= max_workers:
+        with ShardedListenAggregator(num_shards=workers) as aggregator:
+            for song in songs:
+                aggregator.register_song(song)
+            start = time.perf_counter()
+            aggregator.add_encoded_events(indices, seconds)
+            top = aggregator.get_top_k_songs(10)
+            elapsed = time.perf_counter() - start
+            if baseline:
+                # Timings are only meaningful if every event was aggregated
+                assert [s.song_id for s in top] == [s.song_id for s in queue.get_top_k_songs(10)]
+                assert aggregator.get_listen_stats(top[0].song_id)[0] == queue.song_map[top[0].song_id][0]
+        line = f"{workers} worker(s): {elapsed:.2f}s ({num_events / elapsed:,.0f} events/s)"
+        if baseline:
+            line += f", {baseline / elapsed:.2f}x vs reference"
+        print(line)
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# File: benchmarks/bench_shuffle_queue.py
+
+"""
+ShuffleQueue session cost versus the copy + random.shuffle + rebuild approach.
+Usage: python benchmarks/bench_shuffle_queue.py [songs] [draws]
+e.g.   python benchmarks/bench_shuffle_queue.py 1000000 1000
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+
+from models.song import Song
+from core.playlist_engine import PlaylistEngine
+from core.song_rating_tree import SongRatingTree
+from specialized.favorite_sorted_queue import FavoriteSortedQueue
+from specialized.shuffle_queue import ShuffleQueue, rating_listen_weight
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"  {label}: {(time.perf_counter() - start) * 1e3:,.1f} ms")
+    return result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    draws = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = random.Random(5)
+    playlist = PlaylistEngine()
+    tree = SongRatingTree()
+    favorites = FavoriteSortedQueue()
+    for i in range(size):
+        song = Song(str(i), f"Song{i}", f"Artist{i % 2000}", 180)
+        playlist.append_song(song)
+        tree.insert_song(song, rng.randint(1, 5))
+        if i % 20 == 0:
+            favorites.add_listen_time(song, rng.randint(60, 6000))
+    print(f"{size:,}-song playlist, {draws:,} draws per session")
+
+    def copy_shuffle_rebuild():
+        songs = playlist.display_playlist()
+        random.shuffle(songs)
+        rebuilt = PlaylistEngine()
+        for song in songs:
+            rebuilt.append_song(song)
+        return rebuilt
+    timed("copy + shuffle + rebuild", copy_shuffle_rebuild)
+
+    def session(queue):
+        for _ in range(draws):
+            queue.next_song()
+    queue = timed("uniform ShuffleQueue build", lambda: ShuffleQueue(playlist, seed=1))
+    timed(f"uniform {draws:,} draws", lambda: session(queue))
+    weight_fn = rating_listen_weight(tree, favorites)
+    queue = timed("weighted ShuffleQueue build (incl. rating index)", lambda: ShuffleQueue(playlist, weight_fn, artist_gap=5, seed=1))
+    timed(f"weighted + artist_gap=5 {draws:,} draws", lambda: session(queue))
+    timed(f"{draws:,} incremental weight updates",
+          lambda: [queue.update_weight(str(rng.randrange(size)), rng.random() * 10) for _ in range(draws)])
+
+
+if __name__ == "__main__":
+    main()
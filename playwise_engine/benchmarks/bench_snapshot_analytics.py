@@ -0,0 +1,67 @@
+# File: benchmarks/bench_snapshot_analytics.py
+
+"""
+SystemSnapshot versus SnapshotAnalytics (NumPy and pure-Python paths).
+Usage: python benchmarks/bench_snapshot_analytics.py [size ...]
+e.g.   python benchmarks/bench_snapshot_analytics.py 1000000 10000000
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+
+from models.song import Song
+from core.playlist_engine import PlaylistEngine
+from core.playback_history import PlaybackHistory
+from core.song_rating_tree import SongRatingTree
+from core.system_snapshot import SystemSnapshot
+from core.snapshot_analytics import SnapshotAnalytics, np
+from specialized.favorite_sorted_queue import FavoriteSortedQueue
+
+
+def build(size, seed=1):
+    rng = random.Random(seed)
+    playlist = PlaylistEngine()
+    history = PlaybackHistory()
+    tree = SongRatingTree()
+    queue = FavoriteSortedQueue()
+    for i in range(size):
+        song = Song(str(i), f"Song{i}", f"Artist{i % 10000}", rng.randint(60, 600))
+        playlist.append_song(song)
+        tree.insert_song(song, rng.randint(1, 5))
+        if i % 10 == 0:
+            history.play_song(song)
+            queue.add_listen_time(song, rng.randint(30, 3000))
+    return playlist, history, tree, queue
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    func()
+    print(f"  {label}: {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000_000]
+    for size in sizes:
+        print(f"{size:,} songs (building...)")
+        playlist, history, tree, queue = build(size)
+        timed("SystemSnapshot.export_snapshot", SystemSnapshot(playlist, history, tree).export_snapshot)
+        python_path = SnapshotAnalytics(playlist, history, tree, queue, use_numpy=False)
+        timed("SnapshotAnalytics (pure Python) export", python_path.export_snapshot)
+        if np is None:
+            print("  NumPy not installed; vectorized path skipped")
+            continue
+        numpy_path = SnapshotAnalytics(playlist, history, tree, queue)
+        timed("SnapshotAnalytics (NumPy) export", numpy_path.export_snapshot)
+        timed("  of which metrics on cached columns", lambda: (
+            numpy_path.top_k_longest_songs(5), numpy_path.rating_histogram(),
+            numpy_path.duration_percentiles(), numpy_path.total_playtime(),
+            numpy_path.artist_aggregates()))
+
+
+if __name__ == "__main__":
+    main()
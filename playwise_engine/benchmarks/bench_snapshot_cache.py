@@ -0,0 +1,54 @@
+# File: benchmarks/bench_snapshot_cache.py
+
+"""
+Cost of SystemSnapshot.export_snapshot on an idle engine (cache hits)
+versus after a single mutation (one dirty section).
+Usage: python benchmarks/bench_snapshot_cache.py [songs] [calls]
+e.g.   python benchmarks/bench_snapshot_cache.py 1000000 10000
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+
+from models.song import Song
+from core.playlist_engine import PlaylistEngine
+from core.playback_history import PlaybackHistory
+from core.song_rating_tree import SongRatingTree
+from core.system_snapshot import SystemSnapshot
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    playlist = PlaylistEngine()
+    history = PlaybackHistory()
+    tree = SongRatingTree()
+    for i in range(size):
+        song = Song(str(i), f"Song{i}", f"Artist{i % 1000}", 60 + (i * 7919) % 600)
+        playlist.append_song(song)
+        tree.insert_song(song, i % 5 + 1)
+        history.play_song(song)
+    snap = SystemSnapshot(playlist, history, tree)
+
+    start = time.perf_counter()
+    snap.export_snapshot()
+    print(f"{size:,} songs, cold export: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        snap.export_snapshot()
+    elapsed = time.perf_counter() - start
+    print(f"idle export x{calls:,}: {elapsed / calls * 1e6:.2f} us/call")
+
+    history.play_song(playlist.get_song(0))
+    start = time.perf_counter()
+    snap.export_snapshot()
+    print(f"export after one play (history section dirty): {(time.perf_counter() - start) * 1e3:.3f} ms")
+    print(f"cache stats: {snap.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# File: benchmarks/bench_song_library.py
+
+"""
+Memory and latency benchmark: SongLibrary (shared catalog + reverse index)
+versus independent PlaylistEngine instances that each mint their own Song objects.
+Usage: python benchmarks/bench_song_library.py [playlists] [catalog_songs] [songs_per_playlist]
+e.g.   python benchmarks/bench_song_library.py 100000 1000000 20
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+import tracemalloc
+
+from core.song_library import SongLibrary
+from core.playlist_engine import PlaylistEngine
+
+
+def build_library(catalog_rows, assignments):
+    library = SongLibrary()
+    for title, artist, duration in catalog_rows:
+        library.intern_song(title, artist, duration)
+    for p, picks in enumerate(assignments):
+        name = f"playlist{p}"
+        library.create_playlist(name)
+        for i in picks:
+            title, artist, _ = catalog_rows[i]
+            library.add_to_playlist(name, f"{title.lower()}_{artist.lower()}")
+    return library
+
+
+def build_independent(catalog_rows, assignments):
+    playlists = []
+    for picks in assignments:
+        playlist = PlaylistEngine()
+        for i in picks:
+            title, artist, duration = catalog_rows[i]
+            playlist.add_song(title, artist, duration)
+        playlists.append(playlist)
+    return playlists
+
+
+def measure(label, builder, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = builder(*args)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label}: build {elapsed:.2f}s, {current / 2**20:,.1f} MiB")
+    return result
+
+
+def main():
+    num_playlists = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    catalog_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    per_playlist = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    rng = random.Random(7)
+    catalog_rows = [(f"Song{i}", f"Artist{i % 5000}", 120 + i % 300) for i in range(catalog_size)]
+    # Skewed popularity so popular tracks appear in many playlists
+    assignments = [sorted({int(catalog_size * rng.random() ** 3) for _ in range(per_playlist)})
+                   for _ in range(num_playlists)]
+
+    print(f"{num_playlists:,} playlists x ~{per_playlist} songs over a {catalog_size:,}-song catalog")
+    measure("Independent playlists (catalog not included)", build_independent, catalog_rows, assignments)
+    library = measure("SongLibrary (catalog included)", build_library, catalog_rows, assignments)
+
+    song_ids = [f"song{i}_artist{i % 5000}" for i in range(0, catalog_size, max(1, catalog_size // 1000))]
+    start = time.perf_counter()
+    for song_id in song_ids:
+        library.playlists_containing(song_id)
+    elapsed = time.perf_counter() - start
+    print(f"playlists_containing: {elapsed / len(song_ids) * 1e6:.1f} us/query")
+
+    hot_ids = [f"song{i}_artist{i % 5000}" for i in range(100)]
+    touched = sum(len(library.song_playlists.get(song_id, ())) for song_id in hot_ids)
+    start = time.perf_counter()
+    for song_id in hot_ids:
+        library.remove_song_everywhere(song_id)
+    elapsed = time.perf_counter() - start
+    print(f"remove_song_everywhere on 100 hottest songs ({touched:,} playlist entries): "
+          f"{elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
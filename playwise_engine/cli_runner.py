@@ -1,25 +1,225 @@
 """
 PlayWise CLI: A terminal-based interface for managing your playlist.
+
+Interactive menu:   python cli_runner.py
+Batch/script mode:  python cli_runner.py --batch commands.txt   (or --batch - for stdin)
+
+Batch input has one command per line, either shell-style
+    add "Fix You" Coldplay 295
+or JSONL
+    {"op": "move", "args": [0, 2]}   /   {"op": "add", "title": "Fix You", "artist": "Coldplay", "duration": 295}
+Results stream to stdout as JSONL with per-command timing, followed by a summary line.
 """
 
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import subprocess
+import argparse
+import contextlib
+import json
+import shlex
+import time
+import unittest
 
 from core.playlist_engine import PlaylistEngine
+from core.playlist_journal import PlaylistJournal
 from core.playback_history import PlaybackHistory
 from core.song_rating_tree import SongRatingTree
 from core.instant_lookup import InstantSongLookup
-from core.sorting import merge_sort
 from core.system_snapshot import SystemSnapshot
 from specialized.duplicate_cleaner import DuplicateCleaner
 from specialized.favorite_sorted_queue import FavoriteSortedQueue
 from models.song import Song
 
+
+class PlayWiseSession:
+    """
+    One set of engine instances shared by the interactive menu and batch mode.
+    """
+
+    def __init__(self):
+        self.playlist = PlaylistEngine()
+        self.journal = PlaylistJournal(self.playlist)   # All playlist edits go through the journal
+        self.history = PlaybackHistory()
+        self.rating_tree = SongRatingTree()
+        self.lookup = InstantSongLookup()
+        self.fav_queue = FavoriteSortedQueue()
+        self.cleaner = DuplicateCleaner()
+        self.snapshot_view = SystemSnapshot(self.playlist, self.history, self.rating_tree)
+
+    def add(self, title, artist, duration):
+        """Returns the added Song, or None if it was a duplicate."""
+        size = self.playlist.size
+        self.journal.add_song(title, artist, duration)
+        if self.playlist.size == size:
+            return None
+        song = self.playlist.tail.song
+        self.lookup.add_song(song)
+        return song
+
+    def show(self):
+        return self.playlist.display_playlist()
+
+    def delete(self, index):
+        self.journal.delete_song(index)
+
+    def move(self, from_index, to_index):
+        self.journal.move_song(from_index, to_index)
+
+    def reverse(self):
+        self.journal.reverse_playlist()
+
+    def rate(self, index, rating):
+        song = self.playlist.get_song(index)
+        self.rating_tree.insert_song(song, rating)
+        return song
+
+    def play(self, index):
+        song = self.playlist.get_song(index)
+        self.history.play_song(song)
+        self.fav_queue.add_listen_time(song, song.duration)
+        return song
+
+    def undo_play(self):
+        """Pops the last playback and re-adds it to the playlist. Returns the song or None."""
+        song = self.history.undo_last_play()
+        if song:
+            self.journal.add_song(song.title, song.artist, song.duration)
+        return song
+
+    def clean(self):
+        """Removes duplicates as one undoable edit. Returns the number removed."""
+        self.cleaner.seen.clear()
+        return self.journal.delete_where(lambda song: self.cleaner.is_duplicate(song.title, song.artist))
+
+    def search(self, title):
+        return self.lookup.get_by_title(title)
+
+    def top(self, k=3):
+        return self.fav_queue.get_top_k_songs(k)
+
+    def snapshot(self):
+        return self.snapshot_view.export_snapshot()
+
+    def sort(self, by):
+        if by in ('1', 'title'):
+            self.journal.sort_playlist(lambda s: s.title)
+        elif by in ('2', 'duration'):
+            self.journal.sort_playlist(lambda s: s.duration)
+        else:
+            raise ValueError("Invalid sort option.")
+
+    def undo(self):
+        return self.journal.undo()
+
+    def redo(self):
+        return self.journal.redo()
+
+
+# Batch op name -> (session method, argument names, argument converters)
+BATCH_COMMANDS = {
+    'add': ('add', ('title', 'artist', 'duration'), (str, str, int)),
+    'show': ('show', (), ()),
+    'delete': ('delete', ('index',), (int,)),
+    'move': ('move', ('from_index', 'to_index'), (int, int)),
+    'reverse': ('reverse', (), ()),
+    'rate': ('rate', ('index', 'rating'), (int, int)),
+    'play': ('play', ('index',), (int,)),
+    'undo_play': ('undo_play', (), ()),
+    'clean': ('clean', (), ()),
+    'search': ('search', ('title',), (str,)),
+    'top': ('top', ('k',), (int,)),
+    'snapshot': ('snapshot', (), ()),
+    'sort': ('sort', ('by',), (str,)),
+    'undo': ('undo', (), ()),
+    'redo': ('redo', (), ()),
+}
+
+
+def to_jsonable(value):
+    if isinstance(value, Song):
+        return {'song_id': value.song_id, 'title': value.title,
+                'artist': value.artist, 'duration': value.duration}
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    return value
+
+
+def parse_command(line):
+    """
+    Parses one batch line into (op, args). Blank lines and # comments return None.
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line.startswith('{'):
+        record = json.loads(line)
+        op = record.get('op')
+        if op not in BATCH_COMMANDS:
+            raise ValueError(f"Unknown op: {op}")
+        names = BATCH_COMMANDS[op][1]
+        args = record['args'] if 'args' in record else [record[n] for n in names if n in record]
+        return op, list(args)
+    parts = shlex.split(line)
+    if parts[0] not in BATCH_COMMANDS:
+        raise ValueError(f"Unknown op: {parts[0]}")
+    return parts[0], parts[1:]
+
+
+def run_batch(lines, out, session=None):
+    """
+    Executes batch commands against one session without screen clears or subprocesses.
+    Engine chatter (e.g. duplicate warnings) goes to stderr so stdout stays valid JSONL.
+    Returns the summary dict.
+    """
+    session = session or PlayWiseSession()
+    stats = {}
+    errors = 0
+    started = time.perf_counter()
+    for line_no, line in enumerate(lines, 1):
+        op = None
+        begin = time.perf_counter()
+        try:
+            parsed = parse_command(line)
+            if parsed is None:
+                continue
+            op, args = parsed
+            method, _, converters = BATCH_COMMANDS[op]
+            if len(args) > len(converters):
+                raise ValueError(f"{op} takes at most {len(converters)} arguments")
+            args = [convert(arg) for convert, arg in zip(converters, args)]
+            with contextlib.redirect_stdout(sys.stderr):
+                result = getattr(session, method)(*args)
+            record = {'line': line_no, 'op': op, 'ok': True, 'result': to_jsonable(result)}
+        except Exception as e:
+            errors += 1
+            record = {'line': line_no, 'op': op, 'ok': False, 'error': str(e) or type(e).__name__}
+        elapsed_us = (time.perf_counter() - begin) * 1e6
+        record['elapsed_us'] = round(elapsed_us, 1)
+        out.write(json.dumps(record) + '\n')
+        out.flush()     # Stream each result even when stdout is a pipe
+        entry = stats.setdefault(op or 'invalid', [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed_us
+
+    summary = {
+        'commands': sum(count for count, _ in stats.values()),
+        'errors': errors,
+        'total_ms': round((time.perf_counter() - started) * 1e3, 3),
+        'per_op': {op: {'count': count, 'total_us': round(total, 1), 'mean_us': round(total / count, 2)}
+                   for op, (count, total) in stats.items()},
+    }
+    out.write(json.dumps({'summary': summary}) + '\n')
+    out.flush()
+    return summary
+
+
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # ANSI clear instead of spawning a `clear`/`cls` process on every menu iteration
+    print("\033[2J\033[H", end="")
 
 def print_menu():
     print("\nPlayWise CLI")
@@ -37,21 +237,22 @@ def print_menu():
     print("12. Show system snapshot")
     print("13. Sort playlist")
     print("14. Run all test cases")
-    print("15. Exit")
+    print("15. Undo last edit")
+    print("16. Redo edit")
+    print("17. Exit")
 
 def format_duration(seconds):
     return f"{seconds // 60}:{seconds % 60:02d}"
 
-def main():
-    clear_screen()
+def run_test_cases():
+    # Runs the suite in-process instead of spawning another interpreter
+    import test_cases
+    suite = unittest.defaultTestLoader.loadTestsFromModule(test_cases)
+    unittest.TextTestRunner(stream=sys.stdout, verbosity=1).run(suite)
 
-    playlist = PlaylistEngine()
-    history = PlaybackHistory()
-    rating_tree = SongRatingTree()
-    lookup = InstantSongLookup()
-    fav_queue = FavoriteSortedQueue()
-    cleaner = DuplicateCleaner()
-    song_counter = 1
+def interactive():
+    clear_screen()
+    session = PlayWiseSession()
 
     while True:
         print_menu()
@@ -63,14 +264,11 @@ def main():
                 title = input("Song title: ")
                 artist = input("Artist: ")
                 duration = int(input("Duration (seconds): "))
-                song = Song(str(song_counter), title, artist, duration)
-                song_counter += 1
-                playlist.add_song(title, artist, duration)
-                lookup.add_song(song)
-                print("Song added.")
+                if session.add(title, artist, duration):
+                    print("Song added.")
 
             elif choice == '2':
-                songs = playlist.display_playlist()
+                songs = session.show()
                 if not songs:
                     print("Playlist is empty.")
                 else:
@@ -79,55 +277,50 @@ def main():
 
             elif choice == '3':
                 idx = int(input("Index to delete: "))
-                playlist.delete_song(idx)
+                session.delete(idx)
                 print("Song deleted.")
 
             elif choice == '4':
                 from_idx = int(input("Move from index: "))
                 to_idx = int(input("Move to index: "))
-                playlist.move_song(from_idx, to_idx)
+                session.move(from_idx, to_idx)
                 print("Song moved.")
 
             elif choice == '5':
-                playlist.reverse_playlist()
+                session.reverse()
                 print("Playlist reversed.")
 
             elif choice == '6':
                 idx = int(input("Index to rate: "))
                 rating = int(input("Rating (1–5): "))
-                song = playlist.get_song(idx)
-                rating_tree.insert_song(song, rating)
+                session.rate(idx, rating)
                 print("Song rated.")
 
             elif choice == '7':
                 idx = int(input("Index to play: "))
-                song = playlist.get_song(idx)
-                history.play_song(song)
-                fav_queue.add_listen_time(song, song.duration)
+                song = session.play(idx)
                 print(f"Played: {song.title} by {song.artist}")
 
             elif choice == '8':
-                song = history.undo_last_play()
-                if song:
-                    playlist.add_song(song.title, song.artist, song.duration)
+                if session.undo_play():
                     print("Last playback undone.")
                 else:
                     print("No playback history.")
 
             elif choice == '9':
-                cleaner.clean_playlist(playlist)
-                print("Duplicates cleaned.")
+                removed = session.clean()
+                print(f"Duplicates cleaned ({removed} removed).")
 
             elif choice == '10':
                 title = input("Song title to search: ")
-                song = lookup.get_by_title(title)
+                song = session.search(title)
                 if song:
                     print(f"Found: {song.title} by {song.artist} ({format_duration(song.duration)})")
                 else:
                     print("Song not found.")
 
             elif choice == '11':
-                top = fav_queue.get_top_k_songs(3)
+                top = session.top(3)
                 if not top:
                     print("Top 3 Favorite Songs:\n(No songs have been played yet.)")
                 else:
@@ -136,7 +329,7 @@ def main():
                         print(f"{i}. {song.title} by {song.artist} ({format_duration(song.duration)})")
 
             elif choice == '12':
-                snapshot = SystemSnapshot(playlist, history, rating_tree).export_snapshot()
+                snapshot = session.snapshot()
                 print("System Snapshot:")
                 for key, value in snapshot.items():
                     print(f"{key}: {value}")
@@ -144,39 +337,47 @@ def main():
             elif choice == '13':
                 print("Sort by: 1. Title  2. Duration")
                 sort_choice = input("Sort by: ").strip()
-                songs = playlist.display_playlist()
-                if sort_choice == '1':
-                    sorted_songs = merge_sort(songs, lambda s: s.title)
-                elif sort_choice == '2':
-                    sorted_songs = merge_sort(songs, lambda s: s.duration)
-                else:
-                    print("Invalid sort option.")
+                try:
+                    session.sort(sort_choice)
+                except ValueError as e:
+                    print(e)
                     continue
-
-                # Overwrite playlist with sorted order
-                playlist.clear_playlist()
-                for song in sorted_songs:
-                    playlist.add_song(song.title, song.artist, song.duration)
                 print("Playlist sorted and updated.")
 
             elif choice == '14':
                 print("Running all test cases...")
-                result = subprocess.run([sys.executable, 'test_cases.py'], capture_output=True, text=True)
-                print(result.stdout)
-                if result.stderr:
-                    print("Test Errors:\n", result.stderr)
+                run_test_cases()
 
             elif choice == '15':
+                print("Edit undone." if session.undo() else "Nothing to undo.")
+
+            elif choice == '16':
+                print("Edit redone." if session.redo() else "Nothing to redo.")
+
+            elif choice == '17':
                 print("Exiting PlayWise CLI.")
                 sys.exit(0)
 
             else:
-                print("Invalid choice. Please select a number from 1 to 15.")
+                print("Invalid choice. Please select a number from 1 to 17.")
 
         except ValueError:
             print("Invalid input. Please enter numbers where expected.")
         except Exception as e:
             print(f"An error occurred: {e}")
 
+def main():
+    parser = argparse.ArgumentParser(description="PlayWise CLI")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run commands from FILE ('-' for stdin) and stream JSONL results")
+    args = parser.parse_args()
+    if args.batch is None:
+        interactive()
+    elif args.batch == '-':
+        run_batch(sys.stdin, sys.stdout)
+    else:
+        with open(args.batch, encoding='utf-8') as f:
+            run_batch(f, sys.stdout)
+
 if __name__ == "__main__":
     main()
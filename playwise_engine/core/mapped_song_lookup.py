@@ -0,0 +1,184 @@
+# File: core/mapped_song_lookup.py
+
+"""
+Disk-backed, memory-mapped counterpart of InstantSongLookup for catalogs too large for RAM.
+
+File layout (little endian):
+    header   MAGIC, record count, id/title table offsets and slot counts, records offset
+    id table     open-addressing slots of (u64 key hash, u64 record offset); offset 0 = empty
+    title table  same, keyed by title.lower()
+    records      u16 id len, u16 title len, u16 artist len, u32 duration, utf-8 bytes
+"""
+
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from hashlib import blake2b
+
+from models.song import Song
+
+MAGIC = b"PWCAT01\0"
+HEADER = struct.Struct("<8sQQQQQQ")     # magic, count, id_off, id_slots, title_off, title_slots, rec_off
+SLOT = struct.Struct("<QQ")
+RECORD = struct.Struct("<HHHI")
+
+
+def _key_hash(key):
+    # Stable across processes (unlike hash()); never 0 so it can't look like an empty slot
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") or 1
+
+
+def _read_record(buf, offset):
+    id_len, title_len, artist_len, duration = RECORD.unpack_from(buf, offset)
+    start = offset + RECORD.size
+    song_id = buf[start:start + id_len].decode("utf-8")
+    start += id_len
+    title = buf[start:start + title_len].decode("utf-8")
+    start += title_len
+    artist = buf[start:start + artist_len].decode("utf-8")
+    return Song(song_id, title, artist, duration)
+
+
+def build_catalog_index(songs, path, count=None, load_factor=0.5):
+    """
+    Writes songs to an on-disk index in a single pass. `count` (or len(songs)) sizes
+    the hash tables up front; tables are filled through an mmap so memory use stays
+    flat. Later songs win on duplicate ids/titles, as in InstantSongLookup.
+    Time Complexity: O(n)
+    Space Complexity: O(1) in RAM, O(n) on disk
+    """
+    if count is None:
+        count = len(songs)
+    slots = max(8, int(count / load_factor) + 1)
+    id_off = HEADER.size
+    title_off = id_off + slots * SLOT.size
+    rec_off = title_off + slots * SLOT.size
+
+    with open(path, "w+b") as f:
+        f.truncate(rec_off)
+        table = mmap.mmap(f.fileno(), rec_off)
+        f.seek(rec_off)
+        position = rec_off
+        unique = {id_off: 0, title_off: 0}
+
+        def insert(table_off, key, offset):
+            h = _key_hash(key)
+            slot = h % slots
+            while True:
+                at = table_off + slot * SLOT.size
+                slot_hash, slot_offset = SLOT.unpack_from(table, at)
+                if slot_offset == 0:
+                    unique[table_off] += 1
+                    if unique[table_off] > count:
+                        raise ValueError("More distinct songs than the declared count")
+                    SLOT.pack_into(table, at, h, offset)
+                    return
+                if slot_hash == h:
+                    f.flush()
+                    head = os.pread(f.fileno(), RECORD.size, slot_offset)
+                    id_len, title_len, artist_len, _ = RECORD.unpack(head)
+                    raw = os.pread(f.fileno(), RECORD.size + id_len + title_len + artist_len, slot_offset)
+                    existing = _read_record(raw, 0)
+                    if (existing.song_id if table_off == id_off else existing.title.lower()) == key:
+                        SLOT.pack_into(table, at, h, offset)
+                        return
+                slot = (slot + 1) % slots
+
+        for song in songs:
+            song_id = str(song.song_id).encode("utf-8")
+            title = song.title.encode("utf-8")
+            artist = song.artist.encode("utf-8")
+            f.write(RECORD.pack(len(song_id), len(title), len(artist), song.duration))
+            f.write(song_id)
+            f.write(title)
+            f.write(artist)
+            insert(id_off, str(song.song_id), position)
+            insert(title_off, song.title.lower(), position)
+            position += RECORD.size + len(song_id) + len(title) + len(artist)
+
+        HEADER.pack_into(table, 0, MAGIC, unique[id_off], id_off, slots, title_off, slots, rec_off)
+        table.flush()
+        table.close()
+    return unique[id_off]
+
+
+class MappedSongLookup:
+    """
+    Read-only InstantSongLookup over a file from build_catalog_index().
+    The file is mmap'd, so only pages touched by lookups become resident; decoded
+    Song objects are kept in an optional LRU cache (cache_size=0 disables it).
+    """
+
+    def __init__(self, path, cache_size=4096):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self._id_off, self._id_slots, self._title_off, self._title_slots, _ = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a PlayWise catalog index: {path}")
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self):
+        return self.count
+
+    def _probe(self, table_off, slots, key, by_id):
+        h = _key_hash(key)
+        slot = h % slots
+        buf = self._map
+        while True:
+            slot_hash, offset = SLOT.unpack_from(buf, table_off + slot * SLOT.size)
+            if offset == 0:
+                return None
+            if slot_hash == h:
+                song = _read_record(buf, offset)
+                if (song.song_id if by_id else song.title.lower()) == key:
+                    return song
+            slot = (slot + 1) % slots
+
+    def _lookup(self, kind, key):
+        cache_key = (kind, key)
+        if self.cache_size:
+            song = self._cache.get(cache_key)
+            if song is not None:
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return song
+            self.cache_misses += 1
+        if kind == "id":
+            song = self._probe(self._id_off, self._id_slots, key, True)
+        else:
+            song = self._probe(self._title_off, self._title_slots, key, False)
+        if song is not None and self.cache_size:
+            self._cache[cache_key] = song
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return song
+
+    def get_by_id(self, song_id):
+        """
+        Retrieves song by its unique ID.
+        Time Complexity: O(1) expected (one or two page touches)
+        """
+        return self._lookup("id", str(song_id))
+
+    def get_by_title(self, title):
+        """
+        Retrieves song by title (case-insensitive).
+        Time Complexity: O(1) expected
+        """
+        return self._lookup("title", title.lower())
+
+    def close(self):
+        self._cache.clear()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,11 +1,15 @@
 # File: core/playback_history.py
 
 from collections import deque
+from itertools import islice
 from models.song import Song
 
 class PlaybackHistory:
     def __init__(self):
         self.history_stack = deque()  # Stack to hold played songs (LIFO)
+        self.version = 0              # Bumped on every mutation (used by snapshot caching)
+        self.play_sequence = 0        # Total plays ever recorded (never decreases)
+        self.sequence_stack = deque() # Sequence number of each entry in history_stack
 
     def play_song(self, song):
         """
@@ -14,6 +18,9 @@ class PlaybackHistory:
         Space Complexity: O(1)
         """
         self.history_stack.append(song)
+        self.play_sequence += 1
+        self.sequence_stack.append(self.play_sequence)
+        self.version += 1
 
     def undo_last_play(self):
         """
@@ -22,6 +29,8 @@ class PlaybackHistory:
         Space Complexity: O(1)
         """
         if self.history_stack:
+            self.version += 1
+            self.sequence_stack.pop()
             return self.history_stack.pop()
         return None
 
@@ -31,4 +40,21 @@ class PlaybackHistory:
         Time Complexity: O(k)
         Space Complexity: O(k)
         """
-        return list(self.history_stack)[-limit:]
+        recent = list(islice(reversed(self.history_stack), limit))
+        recent.reverse()
+        return recent
+
+    def plays_since(self, sequence):
+        """
+        Songs still in history that were played after play number `sequence`, oldest first.
+        Time Complexity: O(k) for k returned plays
+        Space Complexity: O(k)
+        """
+        count = 0
+        for seq in reversed(self.sequence_stack):
+            if seq <= sequence:
+                break
+            count += 1
+        recent = list(islice(reversed(self.history_stack), count))
+        recent.reverse()
+        return recent
@@ -0,0 +1,238 @@
+# File: core/playlist_diff.py
+
+"""
+Edit-script diff, patch and three-way merge between playlist versions, keyed by song_id.
+
+An edit script is a list of operations applied in order:
+    ('delete', song_id)
+    ('move', song_id, after_id)            after_id None means "at the head"
+    ('insert', song_id, after_id, song)
+
+song_ids must be unique within each playlist. PlaylistEngine.add_song compares
+title/artist case-sensitively but lowercases the id, so ("A", "X") and ("a", "x")
+share an id; such playlists are rejected with ValueError (run DuplicateCleaner first).
+"""
+
+from bisect import bisect_left
+
+from core.playlist_engine import SongNode
+
+
+def longest_increasing_subsequence(values):
+    """
+    Patience-sorting LIS. Returns the indices (into values) of one longest
+    strictly increasing subsequence.
+    Time Complexity: O(n log n)
+    Space Complexity: O(n)
+    """
+    tails = []          # tails[k] = smallest tail value of an increasing run of length k+1
+    tail_index = []     # index in values of that tail
+    parent = [-1] * len(values)
+    for i, value in enumerate(values):
+        if not tails or value > tails[-1]:      # Fast path: mostly-sorted input
+            parent[i] = tail_index[-1] if tail_index else -1
+            tails.append(value)
+            tail_index.append(i)
+            continue
+        k = bisect_left(tails, value)
+        tails[k] = value
+        tail_index[k] = i
+        parent[i] = tail_index[k - 1] if k else -1
+    result = []
+    i = tail_index[-1] if tail_index else -1
+    while i != -1:
+        result.append(i)
+        i = parent[i]
+    result.reverse()
+    return result
+
+
+def diff_ids(old_ids, new_ids, songs=None):
+    """
+    Minimal edit script turning old_ids into new_ids (both duplicate-free).
+    Songs kept in place form the longest subsequence common to both orders, so the
+    number of moves is minimal. `songs` maps song_id to Song for inserts.
+    Time Complexity: O(n log n)
+    Space Complexity: O(n)
+    """
+    old_pos = {song_id: i for i, song_id in enumerate(old_ids)}
+    new_set = set(new_ids)
+    if len(old_pos) != len(old_ids) or len(new_set) != len(new_ids):
+        raise ValueError("Playlist contains duplicate song_ids; diff needs unique ids")
+    script = [('delete', song_id) for song_id in old_ids if song_id not in new_set]
+
+    common = [song_id for song_id in new_ids if song_id in old_pos]
+    anchors = {common[i] for i in longest_increasing_subsequence([old_pos[s] for s in common])}
+
+    previous = None
+    for song_id in new_ids:
+        if song_id not in old_pos:
+            script.append(('insert', song_id, previous, songs.get(song_id) if songs else None))
+        elif song_id not in anchors:
+            script.append(('move', song_id, previous))
+        previous = song_id
+    return script
+
+
+def _ids(playlist):
+    ids = []
+    current = playlist.head
+    while current:
+        ids.append(current.song.song_id)
+        current = current.next
+    return ids
+
+
+def _ids_and_songs(playlist):
+    ids, songs = [], {}
+    current = playlist.head
+    while current:
+        ids.append(current.song.song_id)
+        songs[current.song.song_id] = current.song
+        current = current.next
+    return ids, songs
+
+
+def diff_playlists(old_playlist, new_playlist):
+    """
+    Edit script turning old_playlist into new_playlist.
+    Time Complexity: O(n log n)
+    """
+    old_ids = _ids(old_playlist)
+    new_ids, new_songs = _ids_and_songs(new_playlist)
+    return diff_ids(old_ids, new_ids, new_songs)
+
+
+def apply_patch(playlist, script):
+    """
+    Applies an edit script to a PlaylistEngine in place by relinking nodes.
+    Time Complexity: O(n) to index nodes + O(1) per operation
+    Space Complexity: O(n)
+    """
+    nodes = {}
+    current = playlist.head
+    while current:
+        if current.song.song_id in nodes:
+            raise ValueError(f"Playlist contains duplicate song_id {current.song.song_id!r}")
+        nodes[current.song.song_id] = current
+        current = current.next
+    for op in script:
+        if op[0] == 'delete':
+            playlist.unlink_node(nodes.pop(op[1]))
+            continue
+        if op[0] == 'move':
+            node = nodes[op[1]]
+            playlist.unlink_node(node)
+        else:
+            if op[3] is None:
+                raise ValueError(f"Insert of {op[1]} carries no Song")
+            node = nodes[op[1]] = SongNode(op[3])
+        after = nodes[op[2]] if op[2] is not None else None
+        playlist.insert_node(node, after, after.next if after else playlist.head)
+
+
+def three_way_merge(base, ours, theirs):
+    """
+    Merges two concurrent edits of a common base playlist.
+    A song deleted on either side is deleted; songs inserted on either side are kept.
+    Ordering follows ours, then theirs' moves/inserts are replayed relative to their
+    predecessor. If both sides moved the same song differently, ours wins and the
+    song_id is reported as a conflict.
+    Returns (merged list of Songs, list of conflicting song_ids).
+    Time Complexity: O(n log n)
+    Space Complexity: O(n)
+    """
+    base_ids, base_songs = _ids_and_songs(base)
+    our_ids, our_songs = _ids_and_songs(ours)
+    their_ids, their_songs = _ids_and_songs(theirs)
+
+    our_set = set(our_ids)
+    our_moved = {op[1] for op in diff_ids(base_ids, our_ids) if op[0] == 'move'}
+    their_script = diff_ids(base_ids, their_ids)
+    their_deleted = {op[1] for op in their_script if op[0] == 'delete'}
+
+    # Doubly linked list over song_ids, seeded with ours minus theirs' deletions
+    prev_of, next_of = {}, {}
+    head = None
+    last = None
+    for song_id in our_ids:
+        if song_id in their_deleted:
+            continue
+        prev_of[song_id] = last
+        if last is None:
+            head = song_id
+        else:
+            next_of[last] = song_id
+        last = song_id
+    if last is not None:
+        next_of[last] = None
+
+    def unlink(song_id):
+        nonlocal head
+        p, n = prev_of.pop(song_id), next_of.pop(song_id)
+        if p is None:
+            head = n
+        else:
+            next_of[p] = n
+        if n is not None:
+            prev_of[n] = p
+
+    def link_after(song_id, after):
+        nonlocal head
+        n = head if after is None else next_of[after]
+        prev_of[song_id], next_of[song_id] = after, n
+        if after is None:
+            head = song_id
+        else:
+            next_of[after] = song_id
+        if n is not None:
+            prev_of[n] = song_id
+
+    # Theirs' predecessor chain lets us fall back to the nearest surviving predecessor
+    their_prev = {song_id: (their_ids[i - 1] if i else None) for i, song_id in enumerate(their_ids)}
+
+    def anchor(after):
+        while after is not None and after not in prev_of:
+            after = their_prev[after]
+        return after
+
+    conflicts = []
+    for op in their_script:
+        kind, song_id = op[0], op[1]
+        if kind == 'move':
+            if song_id not in prev_of:          # Deleted by ours
+                continue
+            if song_id in our_moved:
+                if anchor(op[2]) != prev_of[song_id]:
+                    conflicts.append(song_id)
+                continue
+            unlink(song_id)
+            link_after(song_id, anchor(op[2]))
+        elif kind == 'insert':
+            if song_id in our_set:              # Inserted on both sides: keep ours
+                continue
+            link_after(song_id, anchor(op[2]))
+
+    songs = {}
+    songs.update(base_songs)
+    songs.update(their_songs)
+    songs.update(our_songs)
+    merged = []
+    song_id = head
+    while song_id is not None:
+        merged.append(songs[song_id])
+        song_id = next_of[song_id]
+    return merged, conflicts
+
+
+def merge_into(ours, base, theirs):
+    """
+    Three-way merges theirs into the `ours` PlaylistEngine in place (only the
+    differing songs are relinked). Returns the list of conflicting song_ids.
+    Time Complexity: O(n log n)
+    """
+    merged, conflicts = three_way_merge(base, ours, theirs)
+    our_ids = _ids(ours)
+    apply_patch(ours, diff_ids(our_ids, [s.song_id for s in merged],
+                               {s.song_id: s for s in merged}))
+    return conflicts
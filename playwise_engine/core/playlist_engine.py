@@ -14,6 +14,7 @@ class PlaylistEngine:
         self.head = None
         self.tail = None
         self.size = 0
+        self.version = 0  # Bumped on every mutation (used by snapshot caching)
 
     def add_song(self, title, artist, duration):
         """
@@ -29,6 +30,14 @@ class PlaylistEngine:
                 return
             current = current.next
         song = Song(f"{title.lower()}_{artist.lower()}", title, artist, duration)
+        self.append_song(song)
+
+    def append_song(self, song):
+        """
+        Append an existing Song object to the end of the playlist (no duplicate check).
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
         node = SongNode(song)
         if not self.head:
             self.head = self.tail = node
@@ -37,6 +46,7 @@ class PlaylistEngine:
             node.prev = self.tail
             self.tail = node
         self.size += 1
+        self.version += 1
 
     def move_song(self, from_index, to_index):
         """
@@ -92,6 +102,7 @@ class PlaylistEngine:
             current.prev = prev_node
             current.next = target
             target.prev = current
+        self.version += 1
 
     def reverse_playlist(self):
         """
@@ -107,6 +118,7 @@ class PlaylistEngine:
             current = current.prev
 
         self.head, self.tail = self.tail, self.head
+        self.version += 1
 
     def display_playlist(self):
         """
@@ -124,36 +136,91 @@ class PlaylistEngine:
         Deletes the song at the given index from the playlist.
         Time: O(n) | Space: O(1)
         """
+        self.unlink_node(self.get_node(index))
+
+    def get_song(self, index):
+        """
+        Returns the Song object at the given index.
+        Time: O(n) | Space: O(1)
+        """
+        return self.get_node(index).song
+
+    def get_node(self, index):
+        """
+        Returns the SongNode at the given index.
+        Time: O(n) | Space: O(1)
+        """
         if index < 0 or index >= self.size:
             raise IndexError("Index out of range")
         current = self.head
         for _ in range(index):
             current = current.next
-        if current.prev:
-            current.prev.next = current.next
+        return current
+
+    def unlink_node(self, node):
+        """
+        Detaches a node from the list. The node keeps its own prev/next pointers.
+        Time: O(1) | Space: O(1)
+        """
+        if node.prev:
+            node.prev.next = node.next
         else:
-            self.head = current.next
-        if current.next:
-            current.next.prev = current.prev
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
         else:
-            self.tail = current.prev
+            self.tail = node.prev
         self.size -= 1
-        # If list is now empty, reset head and tail
-        if self.size == 0:
-            self.head = None
-            self.tail = None
+        self.version += 1
 
-    def get_song(self, index):
+    def insert_node(self, node, prev_node, next_node):
         """
-        Returns the Song object at the given index.
+        Links a detached node between two adjacent nodes (None means head/tail).
+        Time: O(1) | Space: O(1)
+        """
+        node.prev = prev_node
+        node.next = next_node
+        if prev_node:
+            prev_node.next = node
+        else:
+            self.head = node
+        if next_node:
+            next_node.prev = node
+        else:
+            self.tail = node
+        self.size += 1
+        self.version += 1
+
+    def relink_nodes(self, nodes):
+        """
+        Rebuilds the list from existing nodes in the given order (no new Song/SongNode objects).
+        Time: O(n) | Space: O(1)
+        """
+        prev_node = None
+        for node in nodes:
+            node.prev = prev_node
+            if prev_node:
+                prev_node.next = node
+            prev_node = node
+        if prev_node:
+            prev_node.next = None
+        self.head = nodes[0] if nodes else None
+        self.tail = prev_node
+        self.size = len(nodes)
+        self.version += 1
+
+    def remove_song_by_id(self, song_id):
+        """
+        Removes the first song with the given song_id. Returns True if one was removed.
         Time: O(n) | Space: O(1)
         """
-        if index < 0 or index >= self.size:
-            raise IndexError("Index out of range")
         current = self.head
-        for _ in range(index):
+        while current:
+            if current.song.song_id == song_id:
+                self.unlink_node(current)
+                return True
             current = current.next
-        return current.song
+        return False
 
     def clear_playlist(self):
         """
@@ -163,3 +230,4 @@ class PlaylistEngine:
         self.head = None
         self.tail = None
         self.size = 0
+        self.version += 1
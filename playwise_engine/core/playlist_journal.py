@@ -0,0 +1,243 @@
+# File: core/playlist_journal.py
+
+from collections import deque
+
+from core.sorting import merge_sort
+
+# Record layouts (plain tuples keep the journal compact):
+#   ('add', node, prev, next)            node linked between prev/next
+#   ('delete', node, prev, next)         node unlinked from between prev/next
+#   ('delete_many', [(node, prev, next), ...])   in deletion order
+#   ('move', node, old_prev, old_next, new_prev, new_next)
+#   ('reverse',)
+#   ('sort', old_nodes, new_nodes)
+#   ('clear', head, tail, size)
+
+
+class PlaylistJournal:
+    """
+    Records every PlaylistEngine edit made through it together with its inverse,
+    giving undo/redo that restores exact positions.
+    Records keep SongNode references, so undoing add/delete/move/clear only relinks
+    nodes in O(1); reverse and sort are O(n) by nature.
+    Memory is bounded by max_cost (1 unit per record, plus 1 per node held by a
+    delete_many or clear record and 2 per node held by a sort record); when exceeded
+    the oldest records are compacted into the checkpoint.
+    All edits must go through the journal while it is in use.
+    """
+
+    def __init__(self, playlist, max_cost=100_000):
+        self.playlist = playlist
+        self.max_cost = max_cost
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.cost = 0
+        self._version = playlist.version
+
+    def add_song(self, title, artist, duration):
+        """
+        Time Complexity: O(n) (duplicate check in PlaylistEngine.add_song)
+        """
+        self._check_in_sync()
+        size = self.playlist.size
+        self.playlist.add_song(title, artist, duration)
+        if self.playlist.size != size:
+            node = self.playlist.tail
+            self._record(('add', node, node.prev, None))
+
+    def append_song(self, song):
+        """
+        Time Complexity: O(1)
+        """
+        self._check_in_sync()
+        self.playlist.append_song(song)
+        node = self.playlist.tail
+        self._record(('add', node, node.prev, None))
+
+    def delete_song(self, index):
+        """
+        Time Complexity: O(n) to locate the node, O(1) to undo/redo
+        """
+        self._check_in_sync()
+        node = self.playlist.get_node(index)
+        prev_node, next_node = node.prev, node.next
+        self.playlist.unlink_node(node)
+        self._record(('delete', node, prev_node, next_node))
+
+    def delete_where(self, predicate):
+        """
+        Deletes every song for which predicate(song) is true as one undoable edit.
+        The predicate sees songs in playlist order, so stateful checks (e.g.
+        DuplicateCleaner.is_duplicate) keep the first occurrence.
+        Returns the number of songs deleted.
+        Time Complexity: O(n)
+        """
+        self._check_in_sync()
+        removed = []
+        current = self.playlist.head
+        while current:
+            next_node = current.next
+            if predicate(current.song):
+                removed.append((current, current.prev, current.next))
+                self.playlist.unlink_node(current)
+            current = next_node
+        if removed:
+            self._record(('delete_many', removed))
+        return len(removed)
+
+    def move_song(self, from_index, to_index):
+        """
+        Time Complexity: O(n) to locate the node, O(1) to undo/redo
+        """
+        self._check_in_sync()
+        if from_index == to_index:
+            return
+        node = self.playlist.get_node(from_index)
+        old_prev, old_next = node.prev, node.next
+        self.playlist.move_song(from_index, to_index)
+        self._record(('move', node, old_prev, old_next, node.prev, node.next))
+
+    def reverse_playlist(self):
+        """
+        Time Complexity: O(n)
+        """
+        self._check_in_sync()
+        self.playlist.reverse_playlist()
+        self._record(('reverse',))
+
+    def sort_playlist(self, key, reverse=False):
+        """
+        Sorts in place by relinking existing nodes (merge sort, stable).
+        Time Complexity: O(n log n) | Space: O(n) kept for undo
+        """
+        self._check_in_sync()
+        old_nodes = self._nodes()
+        new_nodes = merge_sort(old_nodes, key=lambda node: key(node.song), reverse=reverse)
+        self.playlist.relink_nodes(new_nodes)
+        self._record(('sort', old_nodes, new_nodes))
+
+    def clear_playlist(self):
+        """
+        Time Complexity: O(1) (the detached chain is kept intact for undo)
+        """
+        self._check_in_sync()
+        pl = self.playlist
+        record = ('clear', pl.head, pl.tail, pl.size)
+        pl.clear_playlist()
+        self._record(record)
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def undo(self):
+        """
+        Reverts the most recent edit. Returns False if there is nothing to undo.
+        Time Complexity: O(1) for add/delete/move/clear, O(n) for reverse/sort
+        """
+        self._check_in_sync()
+        if not self.undo_stack:
+            return False
+        record = self.undo_stack.pop()
+        self.cost -= self._cost(record)
+        self._apply(record, inverse=True)
+        self.redo_stack.append(record)
+        self._version = self.playlist.version
+        return True
+
+    def redo(self):
+        """
+        Re-applies the most recently undone edit. Returns False if there is nothing to redo.
+        Time Complexity: O(1) for add/delete/move/clear, O(n) for reverse/sort
+        """
+        self._check_in_sync()
+        if not self.redo_stack:
+            return False
+        record = self.redo_stack.pop()
+        self._apply(record, inverse=False)
+        self.undo_stack.append(record)
+        self.cost += self._cost(record)
+        self._version = self.playlist.version
+        return True
+
+    def checkpoint(self):
+        """
+        Makes the current state the new baseline: earlier edits can no longer be undone.
+        Time Complexity: O(1) (references are released to the garbage collector)
+        """
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.cost = 0
+
+    def _apply(self, record, inverse):
+        pl = self.playlist
+        op = record[0]
+        if op in ('add', 'delete'):
+            _, node, prev_node, next_node = record
+            if (op == 'add') == inverse:
+                pl.unlink_node(node)
+            else:
+                pl.insert_node(node, prev_node, next_node)
+        elif op == 'delete_many':
+            if inverse:
+                for node, prev_node, next_node in reversed(record[1]):
+                    pl.insert_node(node, prev_node, next_node)
+            else:
+                for node, _, _ in record[1]:
+                    pl.unlink_node(node)
+        elif op == 'move':
+            _, node, old_prev, old_next, new_prev, new_next = record
+            pl.unlink_node(node)
+            if inverse:
+                pl.insert_node(node, old_prev, old_next)
+            else:
+                pl.insert_node(node, new_prev, new_next)
+        elif op == 'reverse':
+            pl.reverse_playlist()
+        elif op == 'sort':
+            pl.relink_nodes(record[1] if inverse else record[2])
+        elif op == 'clear':
+            if inverse:
+                _, pl.head, pl.tail, pl.size = record
+                pl.version += 1
+            else:
+                pl.clear_playlist()
+
+    def _record(self, record):
+        self.undo_stack.append(record)
+        self.cost += self._cost(record)
+        self.redo_stack.clear()
+        while self.cost > self.max_cost and self.undo_stack:
+            self.cost -= self._cost(self.undo_stack.popleft())
+        self._version = self.playlist.version
+
+    @staticmethod
+    def _cost(record):
+        if record[0] == 'sort':
+            return 1 + len(record[1]) + len(record[2])
+        if record[0] == 'delete_many':
+            return 1 + len(record[1])
+        if record[0] == 'clear':
+            return 1 + record[3]    # The detached chain stays alive for undo
+        return 1
+
+    def _nodes(self):
+        nodes = []
+        current = self.playlist.head
+        while current:
+            nodes.append(current)
+            current = current.next
+        return nodes
+
+    def _check_in_sync(self):
+        if self.playlist.version != self._version:
+            raise RuntimeError("Playlist was modified outside the journal; call resync() first")
+
+    def resync(self):
+        """
+        Accepts external edits: drops the journal and adopts the current playlist state.
+        """
+        self.checkpoint()
+        self._version = self.playlist.version
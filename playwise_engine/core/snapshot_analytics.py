@@ -0,0 +1,236 @@
+# File: core/snapshot_analytics.py
+
+import heapq
+from collections import Counter
+
+from core.system_snapshot import SystemSnapshot
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python path is used instead
+    np = None
+
+
+class SnapshotAnalytics(SystemSnapshot):
+    """
+    Column-oriented analytics mode for SystemSnapshot.
+    The playlist is flattened once into columns (durations, ratings, play counts,
+    listen seconds, artist codes); metrics are then computed vectorized with NumPy
+    when it is installed, or with equivalent pure-Python code otherwise.
+    """
+
+    def __init__(self, playlist_engine, playback_history, rating_tree,
+                 favorite_queue=None, use_numpy=None):
+        super().__init__(playlist_engine, playback_history, rating_tree)
+        self.favorite_queue = favorite_queue
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        self._columns = None
+        self._columns_version = None
+
+    def data_version(self):
+        """
+        Combined version of every component the columns are derived from.
+        Time Complexity: O(1)
+        """
+        return (self.playlist_engine.version, self.playback_history.version,
+                self.rating_tree.version,
+                self.favorite_queue.version if self.favorite_queue else 0)
+
+    def refresh(self):
+        """
+        Drops the cached columns and sections so the next call rebuilds them.
+        Time Complexity: O(1)
+        """
+        self._columns = None
+        self.invalidate_cache()
+
+    def columns(self):
+        """
+        Builds (or returns cached) per-song columns for the current playlist.
+        Columns are rebuilt only when a component version has changed.
+        Time Complexity: O(n + h) where h = playback history length, O(1) when cached
+        Space Complexity: O(n)
+        """
+        version = self.data_version()
+        if self._columns is not None and self._columns_version == version:
+            return self._columns
+
+        ratings_by_id = {}
+        def traverse(node):
+            if not node:
+                return
+            traverse(node.left)
+            for song in node.songs:
+                ratings_by_id[song.song_id] = node.rating
+            traverse(node.right)
+        traverse(self.rating_tree.root)
+
+        plays_by_id = Counter(song.song_id for song in self.playback_history.history_stack)
+        listen_by_id = self.favorite_queue.song_map if self.favorite_queue else {}
+
+        songs, durations, ratings, plays, listens, artist_codes = [], [], [], [], [], []
+        artist_index = {}
+        current = self.playlist_engine.head
+        while current:
+            song = current.song
+            songs.append(song)
+            durations.append(song.duration)
+            ratings.append(ratings_by_id.get(song.song_id, 0))   # 0 = unrated
+            plays.append(plays_by_id.get(song.song_id, 0))
+            entry = listen_by_id.get(song.song_id)
+            listens.append(entry[0] if entry else 0)
+            artist_codes.append(artist_index.setdefault(song.artist, len(artist_index)))
+            current = current.next
+
+        columns = {
+            'songs': songs,
+            'artists': list(artist_index),
+            'duration': durations,
+            'rating': ratings,
+            'play_count': plays,
+            'listen_seconds': listens,
+            'artist_code': artist_codes,
+        }
+        if self.use_numpy:
+            for name, dtype in (('duration', np.int64), ('rating', np.int8),
+                                ('play_count', np.int64), ('listen_seconds', np.int64),
+                                ('artist_code', np.int32)):
+                columns[name] = np.asarray(columns[name], dtype=dtype)
+        self._columns = columns
+        self._columns_version = version
+        return columns
+
+    def _top_k(self, column, k):
+        cols = self.columns()
+        values = cols[column]
+        n = len(values)
+        k = min(k, n)
+        if k <= 0:
+            return []
+        if self.use_numpy:
+            # argpartition splits ties arbitrarily, so everything at or above the k-th
+            # value is kept and stable-sorted: ties go to the earlier song, as in heapq
+            if k < n:
+                cutoff = values[np.argpartition(-values, k - 1)[k - 1]]
+                idx = np.flatnonzero(values >= cutoff)
+            else:
+                idx = np.arange(n)
+            idx = idx[np.argsort(-values[idx], kind='stable')][:k]
+        else:
+            idx = heapq.nlargest(k, range(n), key=values.__getitem__)
+        return [cols['songs'][i] for i in idx]
+
+    def top_5_longest_songs(self):
+        """
+        Returns the 5 longest songs from the playlist.
+        Time Complexity: O(n) selection instead of a full sort
+        Space Complexity: O(n)
+        """
+        return self.top_k_longest_songs(5)
+
+    def top_k_longest_songs(self, k=5):
+        """
+        Time Complexity: O(n + k log k)
+        """
+        return self._top_k('duration', k)
+
+    def top_k_most_listened(self, k=5):
+        """
+        Returns up to k songs with the most listen seconds, like
+        FavoriteSortedQueue.get_top_k_songs: songs never listened to are left out,
+        and without a favorite_queue the result is empty.
+        Time Complexity: O(n + k log k)
+        """
+        if self.favorite_queue is None:
+            return []
+        listens = self.favorite_queue.song_map
+        # Zero-listen songs sort last, so trimming them keeps the top order intact
+        return [song for song in self._top_k('listen_seconds', k)
+                if listens.get(song.song_id, (0,))[0] > 0]
+
+    def rating_histogram(self):
+        """
+        Returns rating -> number of playlist songs (0 = unrated).
+        Time Complexity: O(n)
+        """
+        ratings = self.columns()['rating']
+        if self.use_numpy:
+            counts = np.bincount(ratings, minlength=6)
+            return {rating: int(counts[rating]) for rating in range(6)}
+        counts = Counter(ratings)
+        return {rating: counts.get(rating, 0) for rating in range(6)}
+
+    def duration_percentiles(self, percentiles=(50, 90, 99)):
+        """
+        Returns percentile -> duration using linear interpolation (NumPy's default).
+        Time Complexity: O(n) with NumPy, O(n log n) without
+        """
+        durations = self.columns()['duration']
+        if len(durations) == 0:
+            return {p: None for p in percentiles}
+        if self.use_numpy:
+            values = np.percentile(durations, percentiles)
+            return {p: float(v) for p, v in zip(percentiles, values)}
+        ordered = sorted(durations)
+        result = {}
+        for p in percentiles:
+            pos = (len(ordered) - 1) * p / 100
+            low = int(pos)
+            high = min(low + 1, len(ordered) - 1)
+            result[p] = float(ordered[low] + (ordered[high] - ordered[low]) * (pos - low))
+        return result
+
+    def total_playtime(self):
+        """
+        Returns total duration of the playlist in seconds.
+        Time Complexity: O(n)
+        """
+        durations = self.columns()['duration']
+        return int(durations.sum()) if self.use_numpy else sum(durations)
+
+    def artist_aggregates(self):
+        """
+        Returns artist -> {'songs', 'total_duration', 'play_count', 'listen_seconds'}.
+        Time Complexity: O(n + a) where a = number of artists
+        Space Complexity: O(a)
+        """
+        cols = self.columns()
+        artists = cols['artists']
+        codes = cols['artist_code']
+        fields = ('total_duration', 'play_count', 'listen_seconds')
+        sources = ('duration', 'play_count', 'listen_seconds')
+        if self.use_numpy:
+            a = len(artists)
+            song_counts = np.bincount(codes, minlength=a)
+            sums = [np.bincount(codes, weights=cols[src], minlength=a) for src in sources]
+            return {
+                artist: dict([('songs', int(song_counts[i]))] +
+                             [(field, int(total[i])) for field, total in zip(fields, sums)])
+                for i, artist in enumerate(artists)
+            }
+        result = {artist: {'songs': 0, 'total_duration': 0, 'play_count': 0, 'listen_seconds': 0}
+                  for artist in artists}
+        for i, code in enumerate(codes):
+            agg = result[artists[code]]
+            agg['songs'] += 1
+            for field, src in zip(fields, sources):
+                agg[field] += cols[src][i]
+        return result
+
+    def export_snapshot(self):
+        """
+        Returns the SystemSnapshot dashboard plus vectorized analytics.
+        Analytics sections are cached on data_version() like the base sections.
+        Time Complexity: O(n + h) after a change, O(1) when nothing changed
+        Space Complexity: O(n)
+        """
+        data = super().export_snapshot()
+        version = self.data_version()
+        for section, compute in (
+                ('Total Playtime', self.total_playtime),
+                ('Duration Percentiles', self.duration_percentiles),
+                ('Playlist Songs by Rating', self.rating_histogram),
+                ('Top 5 Most Listened', lambda: self.top_k_most_listened(5)),
+                ('Artist Aggregates', self.artist_aggregates)):
+            data[section] = self._cached(section, version, compute)
+        return data
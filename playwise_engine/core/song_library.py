@@ -0,0 +1,122 @@
+# File: core/song_library.py
+
+from models.song import Song
+from core.instant_lookup import InstantSongLookup
+from core.playlist_engine import PlaylistEngine
+
+
+class SongLibrary:
+    """
+    Owns a single interned song catalog shared by many playlists.
+    Playlists reference catalog Song objects instead of minting their own copies,
+    and a reverse index (song_id -> playlist names) keeps cross-playlist queries fast.
+    Playlists managed here should be edited through the library so the index stays in sync.
+    """
+
+    def __init__(self):
+        self.catalog = InstantSongLookup()   # song_id / title -> interned Song
+        self.playlists = {}                  # Maps playlist name to PlaylistEngine
+        self.song_playlists = {}             # Maps song_id to set of playlist names
+
+    def intern_song(self, title, artist, duration):
+        """
+        Returns the catalog Song for (title, artist), creating it on first use.
+        Uses the same song_id scheme as PlaylistEngine.add_song.
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        song_id = f"{title.lower()}_{artist.lower()}"
+        song = self.catalog.get_by_id(song_id)
+        if song is None:
+            song = Song(song_id, title, artist, duration)
+            self.catalog.add_song(song)
+        return song
+
+    def get_song(self, song_id):
+        """
+        Retrieves a catalog song by its ID.
+        Time Complexity: O(1)
+        """
+        return self.catalog.get_by_id(song_id)
+
+    def create_playlist(self, name):
+        """
+        Creates an empty playlist (or returns the existing one with that name).
+        Time Complexity: O(1)
+        """
+        playlist = self.playlists.get(name)
+        if playlist is None:
+            playlist = PlaylistEngine()
+            self.playlists[name] = playlist
+        return playlist
+
+    def delete_playlist(self, name):
+        """
+        Deletes a playlist and drops it from the reverse index.
+        Time Complexity: O(m) where m = songs in the playlist
+        """
+        playlist = self.playlists.pop(name, None)
+        if playlist is None:
+            return False
+        for song in playlist.display_playlist():
+            self._unindex(song.song_id, name)
+        return True
+
+    def add_to_playlist(self, name, song_id):
+        """
+        Appends a catalog song to a playlist, skipping duplicates.
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        song = self.catalog.get_by_id(song_id)
+        if song is None:
+            raise KeyError(f"Song not in catalog: {song_id}")
+        playlist = self.playlists.get(name)
+        if playlist is None:
+            raise KeyError(f"No such playlist: {name}")
+        names = self.song_playlists.setdefault(song_id, set())
+        if name in names:
+            return False
+        playlist.append_song(song)
+        names.add(name)
+        return True
+
+    def remove_from_playlist(self, name, song_id):
+        """
+        Removes a song from one playlist.
+        Time Complexity: O(m) where m = songs in the playlist
+        """
+        names = self.song_playlists.get(song_id)
+        if not names or name not in names:
+            return False
+        self.playlists[name].remove_song_by_id(song_id)
+        self._unindex(song_id, name)
+        return True
+
+    def playlists_containing(self, song_id):
+        """
+        Returns the names of all playlists containing the song.
+        Time Complexity: O(p) where p = playlists containing the song
+        """
+        return set(self.song_playlists.get(song_id, ()))
+
+    def remove_song_everywhere(self, song_id, drop_from_catalog=False):
+        """
+        Removes a song from every playlist that contains it.
+        Time Complexity: O(p * m) touching only the p playlists that contain the song
+        """
+        names = self.song_playlists.pop(song_id, set())
+        for name in names:
+            self.playlists[name].remove_song_by_id(song_id)
+        if drop_from_catalog:
+            song = self.catalog.get_by_id(song_id)
+            if song is not None:
+                self.catalog.remove_song(song)
+        return len(names)
+
+    def _unindex(self, song_id, name):
+        names = self.song_playlists.get(song_id)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self.song_playlists[song_id]
@@ -12,6 +12,7 @@ class RatingNode:
 class SongRatingTree:
     def __init__(self):
         self.root = None
+        self.version = 0  # Bumped on every mutation (used by snapshot caching)
 
     def insert_song(self, song, rating):
         """
@@ -32,6 +33,7 @@ class SongRatingTree:
                 node.songs.append(song)
             return node
         self.root = insert(self.root, rating)
+        self.version += 1
 
     def search_by_rating(self, rating):
         """
@@ -63,6 +65,7 @@ class SongRatingTree:
             delete_from_bucket(node.left)
             delete_from_bucket(node.right)
         delete_from_bucket(self.root)
+        self.version += 1
 
     def in_order_traversal(self):
         """
@@ -25,15 +25,16 @@ def merge(left, right, key_func, reverse):
     i = j = 0
 
     while i < len(left) and j < len(right):
+        # Ties take from the left run so equal keys keep their order (stable, like sorted())
         if reverse:
-            if key_func(left[i]) > key_func(right[j]):
+            if key_func(left[i]) >= key_func(right[j]):
                 merged.append(left[i])
                 i += 1
             else:
                 merged.append(right[j])
                 j += 1
         else:
-            if key_func(left[i]) < key_func(right[j]):
+            if key_func(left[i]) <= key_func(right[j]):
                 merged.append(left[i])
                 i += 1
             else:
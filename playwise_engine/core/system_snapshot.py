@@ -7,6 +7,9 @@ class SystemSnapshot:
         self.playlist_engine = playlist_engine
         self.playback_history = playback_history
         self.rating_tree = rating_tree
+        self._cache = {}        # Maps section name to (component version, value)
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def top_5_longest_songs(self):
         """
@@ -44,14 +47,53 @@ class SystemSnapshot:
         traverse(self.rating_tree.root)
         return counts
 
+    def _cached(self, section, version, compute):
+        """
+        Returns the cached value of a section if its component version is unchanged,
+        otherwise recomputes and stores it.
+        Time Complexity: O(1) on a hit
+        """
+        entry = self._cache.get(section)
+        if entry is not None and entry[0] == version:
+            self.cache_hits += 1
+            return entry[1]
+        self.cache_misses += 1
+        value = compute()
+        self._cache[section] = (version, value)
+        return value
+
+    def invalidate_cache(self):
+        """
+        Forces every section to be recomputed on the next export
+        (e.g. after editing Song objects in place, which bumps no version).
+        """
+        self._cache.clear()
+
+    def cache_stats(self):
+        """
+        Returns snapshot cache hit/miss counters.
+        """
+        total = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / total if total else 0.0,
+        }
+
     def export_snapshot(self):
         """
         Returns all dashboard data in a single dict.
-        Time Complexity: O(n log n) (dominated by sorting)
+        Sections are cached per component version, so only sections whose
+        playlist/history/rating tree changed since the last call are recomputed.
+        Cached values are shared between calls; treat them as read-only.
+        Time Complexity: O(1) when nothing changed, O(n log n) worst case (sorting)
         Space Complexity: O(n)
         """
         return {
-            'Top 5 Longest Songs': self.top_5_longest_songs(),
-            'Most Recently Played': self.most_recently_played(),
-            'Song Count by Rating': self.song_count_by_rating()
+            'Top 5 Longest Songs': self._cached(
+                'top_5_longest', self.playlist_engine.version, self.top_5_longest_songs),
+            'Most Recently Played': self._cached(
+                'recently_played', self.playback_history.version, self.most_recently_played),
+            'Song Count by Rating': self._cached(
+                'count_by_rating', self.rating_tree.version, self.song_count_by_rating)
         }
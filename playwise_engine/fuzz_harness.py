@@ -0,0 +1,785 @@
+# File: fuzz_harness.py
+
+"""
+Differential fuzzing of alternative implementations against the reference structures.
+
+Each scenario drives a reference and a candidate side in lockstep with the same seeded
+random operations, compares every operation's result (or exception type) and the
+observable state after each step, and records per-operation timings for both sides,
+so every run is also a comparative benchmark. Failing sequences are shrunk to a
+minimal reproduction. Everything runs offline.
+
+    playlist    PlaylistEngine + DuplicateCleaner (snapshot undo)  vs  PlaylistJournal
+    dashboard   FavoriteSortedQueue + SongRatingTree               vs  SnapshotAnalytics
+    aggregate   FavoriteSortedQueue                                vs  ShardedListenAggregator
+    lookup      InstantSongLookup                                  vs  MappedSongLookup
+
+Usage: python fuzz_harness.py [--scenario NAME] [--seed N] [--steps N] [--runs N]
+                              [--workload FILE [--replay]] [--json]
+--workload takes a cli_runner batch script or its JSONL output: the operation mix is
+taken from it, or with --replay the captured commands are run verbatim.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from models.song import Song
+from core.playlist_engine import PlaylistEngine
+from core.playlist_journal import PlaylistJournal
+from core.playback_history import PlaybackHistory
+from core.song_rating_tree import SongRatingTree
+from core.instant_lookup import InstantSongLookup
+from core.mapped_song_lookup import MappedSongLookup, build_catalog_index
+from core.snapshot_analytics import SnapshotAnalytics
+from core.system_snapshot import SystemSnapshot
+from specialized.duplicate_cleaner import DuplicateCleaner
+from specialized.favorite_sorted_queue import FavoriteSortedQueue
+from specialized.sharded_listen_aggregator import ShardedListenAggregator
+from cli_runner import BATCH_COMMANDS, parse_command
+
+# Small pools with case variants so duplicate and case-insensitive paths get exercised
+TITLES = ["Yellow", "yellow", "Fix You", "Clocks", "Sparks", "Café", "Hysteria", "Uprising"]
+ARTISTS = ["Coldplay", "coldplay", "Muse"]
+
+
+def song_key(song):
+    return None if song is None else (song.song_id, song.title, song.artist, song.duration)
+
+
+class _Discard:
+    # Swallows engine prints (e.g. duplicate warnings) while fuzzing
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class Side:
+    """
+    One implementation under test. Operations are methods named after the op and
+    return plain comparable values; observe() returns the state compared after each step.
+    """
+
+    def observe(self):
+        return None
+
+    def close(self):
+        pass
+
+
+# ---------------------------------------------------------------- playlist
+
+def playlist_state(playlist):
+    forward, backward = [], []
+    current = playlist.head
+    while current:
+        forward.append(song_key(current.song))
+        current = current.next
+    current = playlist.tail
+    while current:
+        backward.append(song_key(current.song))
+        current = current.prev
+    backward.reverse()
+    return tuple(forward), tuple(backward), playlist.size
+
+
+SORT_KEYS = {'title': lambda s: s.title, '1': lambda s: s.title,
+             'duration': lambda s: s.duration, '2': lambda s: s.duration}
+
+
+class ReferencePlaylist(Side):
+    """PlaylistEngine with naive undo/redo: a full copy of the song list per edit."""
+
+    def __init__(self):
+        self.playlist = PlaylistEngine()
+        self.cleaner = DuplicateCleaner()
+        self.undo_stack = []
+        self.redo_stack = []
+
+    def _edit(self, change):
+        before = self.playlist.display_playlist()
+        change()
+        self.undo_stack.append(before)
+        self.redo_stack.clear()
+
+    def _restore(self, songs):
+        self.playlist.clear_playlist()
+        for song in songs:
+            self.playlist.append_song(song)
+
+    def add(self, title, artist, duration):
+        before = self.playlist.display_playlist()
+        self.playlist.add_song(title, artist, duration)
+        if self.playlist.size != len(before):
+            self.undo_stack.append(before)
+            self.redo_stack.clear()
+
+    def delete(self, index):
+        self._edit(lambda: self.playlist.delete_song(index))
+
+    def move(self, from_index, to_index):
+        if from_index != to_index:
+            self._edit(lambda: self.playlist.move_song(from_index, to_index))
+
+    def reverse(self):
+        self._edit(self.playlist.reverse_playlist)
+
+    def sort(self, by):
+        key = SORT_KEYS[by]
+        self._edit(lambda: self._restore(sorted(self.playlist.display_playlist(), key=key)))
+
+    def clear(self):
+        self._edit(self.playlist.clear_playlist)
+
+    def clean(self):
+        size = self.playlist.size
+        before = self.playlist.display_playlist()
+        self.cleaner.clean_playlist(self.playlist)
+        if self.playlist.size != size:
+            self.undo_stack.append(before)
+            self.redo_stack.clear()
+        return size - self.playlist.size
+
+    def undo(self):
+        if not self.undo_stack:
+            return False
+        self.redo_stack.append(self.playlist.display_playlist())
+        self._restore(self.undo_stack.pop())
+        return True
+
+    def redo(self):
+        if not self.redo_stack:
+            return False
+        self.undo_stack.append(self.playlist.display_playlist())
+        self._restore(self.redo_stack.pop())
+        return True
+
+    def observe(self):
+        return playlist_state(self.playlist)
+
+
+class JournalPlaylist(Side):
+    """PlaylistJournal: node-relinking undo/redo."""
+
+    def __init__(self):
+        self.playlist = PlaylistEngine()
+        self.journal = PlaylistJournal(self.playlist)
+        self.cleaner = DuplicateCleaner()
+
+    def add(self, title, artist, duration):
+        self.journal.add_song(title, artist, duration)
+
+    def delete(self, index):
+        self.journal.delete_song(index)
+
+    def move(self, from_index, to_index):
+        self.journal.move_song(from_index, to_index)
+
+    def reverse(self):
+        self.journal.reverse_playlist()
+
+    def sort(self, by):
+        self.journal.sort_playlist(SORT_KEYS[by])
+
+    def clear(self):
+        self.journal.clear_playlist()
+
+    def clean(self):
+        self.cleaner.seen.clear()
+        return self.journal.delete_where(lambda song: self.cleaner.is_duplicate(song.title, song.artist))
+
+    def undo(self):
+        return self.journal.undo()
+
+    def redo(self):
+        return self.journal.redo()
+
+    def observe(self):
+        return playlist_state(self.playlist)
+
+
+class PlaylistScenario:
+    name = 'playlist'
+    mix = {'add': 30, 'delete': 10, 'move': 15, 'reverse': 5, 'sort': 5,
+           'clear': 1, 'clean': 3, 'undo': 15, 'redo': 8}
+
+    def make_reference(self):
+        return ReferencePlaylist()
+
+    def make_candidate(self):
+        return JournalPlaylist()
+
+    def generate(self, op, rng, reference):
+        size = reference.playlist.size
+        if op == 'add':
+            return (rng.choice(TITLES), rng.choice(ARTISTS), rng.randint(60, 400))
+        if op == 'delete':
+            return (rng.randrange(size + 1),)      # size itself is out of range on purpose
+        if op == 'move':
+            return (rng.randrange(size + 1), rng.randrange(size + 1))
+        if op == 'sort':
+            return (rng.choice(['title', 'duration']),)
+        return ()
+
+
+# ---------------------------------------------------------------- dashboard
+
+def canonical_top(songs, totals):
+    # For structures with different tie rules (FavoriteSortedQueue breaks ties by
+    # song_id) only the totals and the songs strictly above the cut-off are compared
+    pairs = [(totals.get(song.song_id, 0), song.song_id) for song in songs]    # Unplayed songs count as 0
+    if not pairs:
+        return ()
+    cutoff = pairs[-1][0]
+    return tuple(t for t, _ in pairs), tuple(sorted(i for t, i in pairs if t > cutoff))
+
+
+class ReferenceDashboard(Side):
+    """FavoriteSortedQueue top-k and a rating histogram straight from SongRatingTree."""
+
+    def __init__(self, songs):
+        self.playlist = PlaylistEngine()
+        for song in songs:
+            self.playlist.append_song(song)
+        self.history = PlaybackHistory()
+        self.tree = SongRatingTree()
+        self.fav_queue = FavoriteSortedQueue()
+
+    def play(self, index):
+        song = self.playlist.get_song(index)
+        self.history.play_song(song)
+        self.fav_queue.add_listen_time(song, song.duration)
+
+    def rate(self, index, rating):
+        self.tree.insert_song(self.playlist.get_song(index), rating)
+
+    def unrate(self, index):
+        self.tree.delete_song(self.playlist.get_song(index).song_id)
+
+    def _totals(self):
+        return {song_id: total for song_id, (total, _) in self.fav_queue.song_map.items()}
+
+    def top(self, k=3):
+        # Canonical FavoriteSortedQueue answer, plus the exact order SnapshotAnalytics
+        # promises: most listened first, ties to the earlier playlist position
+        totals = self._totals()
+        played = [song for song in self.playlist.display_playlist() if song.song_id in totals]
+        exact = sorted(played, key=lambda song: -totals[song.song_id])[:k]
+        return (canonical_top(self.fav_queue.get_top_k_songs(k), totals),
+                [song.song_id for song in exact])
+
+    def longest(self):
+        return [song.song_id for song in SystemSnapshot(self.playlist, self.history, self.tree).top_5_longest_songs()]
+
+    def histogram(self):
+        rating_of = {}
+        for rating in range(1, 6):          # Highest bucket wins for songs rated twice
+            for song in self.tree.search_by_rating(rating):
+                rating_of[song.song_id] = rating
+        counts = Counter(rating_of.get(song.song_id, 0) for song in self.playlist.display_playlist())
+        return {rating: counts.get(rating, 0) for rating in range(6)}
+
+
+class AnalyticsDashboard(ReferenceDashboard):
+    """Same components read through SnapshotAnalytics' version-cached columns."""
+
+    def __init__(self, songs, use_numpy=None):
+        super().__init__(songs)
+        self.analytics = SnapshotAnalytics(self.playlist, self.history, self.tree, self.fav_queue,
+                                           use_numpy=use_numpy)
+
+    def top(self, k=3):
+        totals = self._totals()
+        top = self.analytics.top_k_most_listened(k)     # Raw output: unplayed songs must not appear
+        return canonical_top(top, totals), [song.song_id for song in top]
+
+    def longest(self):
+        return [song.song_id for song in self.analytics.top_5_longest_songs()]
+
+    def histogram(self):
+        return self.analytics.rating_histogram()
+
+
+class DashboardScenario:
+    name = 'dashboard'
+    mix = {'play': 40, 'rate': 15, 'unrate': 5, 'top': 25, 'histogram': 10, 'longest': 5}
+
+    def __init__(self, songs=40, seed=0, use_numpy=None):
+        rng = random.Random(seed)
+        # Few distinct durations so ties at the k-th place are common
+        self.songs = [Song(str(i), f"Song {i}", rng.choice(ARTISTS), rng.choice(range(120, 301, 30)))
+                      for i in range(songs)]
+        self.use_numpy = use_numpy
+
+    def make_reference(self):
+        return ReferenceDashboard(self.songs)
+
+    def make_candidate(self):
+        return AnalyticsDashboard(self.songs, self.use_numpy)
+
+    def generate(self, op, rng, reference):
+        n = len(self.songs)
+        if op in ('play', 'unrate'):
+            return (rng.randrange(n),)
+        if op == 'rate':
+            return (rng.randrange(n), rng.randint(1, 5))
+        if op == 'top':
+            return (rng.randint(1, 8),)
+        return ()
+
+
+# ---------------------------------------------------------------- aggregate
+
+class ReferenceAggregate(Side):
+    """FavoriteSortedQueue fed one event at a time, plus a play counter."""
+
+    def __init__(self, songs):
+        self.songs = songs
+        self.fav_queue = FavoriteSortedQueue()
+        self.plays = Counter()
+
+    def listen(self, index, seconds):
+        song = self.songs[index]
+        self.fav_queue.add_listen_time(song, seconds)
+        self.plays[song.song_id] += 1
+
+    def bulk(self, indices, seconds):
+        for index, secs in zip(indices, seconds):
+            self.listen(index, secs)
+
+    def top(self, k=3):
+        totals = {song_id: total for song_id, (total, _) in self.fav_queue.song_map.items()}
+        return canonical_top(self.fav_queue.get_top_k_songs(k), totals)
+
+    def stats(self, index):
+        song_id = self.songs[index].song_id
+        entry = self.fav_queue.song_map.get(song_id)
+        return (entry[0] if entry else 0, self.plays[song_id])
+
+
+class ShardedAggregate(Side):
+    """ShardedListenAggregator with a tiny batch size so every path ships many batches."""
+
+    def __init__(self, songs, num_shards, batch_size):
+        self.songs = songs
+        self.aggregator = ShardedListenAggregator(num_shards=num_shards, batch_size=batch_size)
+        for song in songs:                  # Song index == position, as in encoded logs
+            self.aggregator.register_song(song)
+
+    def listen(self, index, seconds):
+        self.aggregator.add_listen_time(self.songs[index], seconds)
+
+    def bulk(self, indices, seconds):
+        self.aggregator.add_encoded_events(indices, seconds)
+
+    def top(self, k=3):
+        top = self.aggregator.get_top_k_songs(k)
+        totals = {song.song_id: self.aggregator.get_listen_stats(song.song_id)[0] for song in top}
+        return canonical_top(top, totals)
+
+    def stats(self, index):
+        return tuple(self.aggregator.get_listen_stats(self.songs[index].song_id))
+
+    def close(self):
+        self.aggregator.close()
+
+
+class AggregateScenario:
+    name = 'aggregate'
+    mix = {'listen': 30, 'bulk': 20, 'top': 25, 'stats': 25}
+
+    def __init__(self, songs=30, num_shards=2, batch_size=8, seed=0):
+        rng = random.Random(seed)
+        self.songs = [Song(str(i), f"Song {i}", rng.choice(ARTISTS), 200) for i in range(songs)]
+        self.num_shards = num_shards
+        self.batch_size = batch_size
+
+    def make_reference(self):
+        return ReferenceAggregate(self.songs)
+
+    def make_candidate(self):
+        return ShardedAggregate(self.songs, self.num_shards, self.batch_size)
+
+    def generate(self, op, rng, reference):
+        n = len(self.songs)
+        if op == 'listen':
+            return (rng.randrange(n), rng.randint(30, 300))
+        if op == 'bulk':
+            count = rng.randint(1, 5 * self.batch_size)
+            return (tuple(rng.randrange(n) for _ in range(count)),
+                    tuple(rng.randint(30, 300) for _ in range(count)))
+        if op == 'top':
+            return (rng.randint(1, 8),)
+        return (rng.randrange(n),)
+
+
+# ---------------------------------------------------------------- lookup
+
+def make_song(title, artist, duration):
+    return Song(f"{title.lower()}_{artist.lower()}", title, artist, duration)
+
+
+class ReferenceLookup(Side):
+    def __init__(self):
+        self.lookup = InstantSongLookup()
+
+    def add(self, title, artist, duration):
+        self.lookup.add_song(make_song(title, artist, duration))
+
+    def search(self, title):
+        return song_key(self.lookup.get_by_title(title))
+
+    def get_by_id(self, song_id):
+        return song_key(self.lookup.get_by_id(song_id))
+
+
+class MappedLookup(Side):
+    """MappedSongLookup; the on-disk index is rebuilt on the first query after adds."""
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix="playwise_fuzz_")
+        self.path = os.path.join(self.directory, "catalog.idx")
+        self.songs = []
+        self.lookup = None
+        self.dirty = True
+
+    def _index(self):
+        if self.dirty:
+            if self.lookup:
+                self.lookup.close()
+            build_catalog_index(self.songs, self.path)
+            self.lookup = MappedSongLookup(self.path)
+            self.dirty = False
+        return self.lookup
+
+    def add(self, title, artist, duration):
+        self.songs.append(make_song(title, artist, duration))
+        self.dirty = True
+
+    def search(self, title):
+        return song_key(self._index().get_by_title(title))
+
+    def get_by_id(self, song_id):
+        return song_key(self._index().get_by_id(song_id))
+
+    def close(self):
+        if self.lookup:
+            self.lookup.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class LookupScenario:
+    name = 'lookup'
+    mix = {'add': 20, 'search': 40, 'get_by_id': 40}
+
+    def make_reference(self):
+        return ReferenceLookup()
+
+    def make_candidate(self):
+        return MappedLookup()
+
+    def generate(self, op, rng, reference):
+        if op == 'add':
+            return (rng.choice(TITLES), rng.choice(ARTISTS), rng.randint(60, 400))
+        title = rng.choice(TITLES + ["Missing"])
+        if op == 'search':
+            return (rng.choice([title, title.upper(), title.lower()]),)
+        return (f"{title.lower()}_{rng.choice(ARTISTS).lower()}",)
+
+
+SCENARIOS = {
+    'playlist': PlaylistScenario,
+    'dashboard': DashboardScenario,
+    'aggregate': AggregateScenario,
+    'lookup': LookupScenario,
+}
+
+
+# ---------------------------------------------------------------- runner
+
+class Mismatch:
+    """First step at which the two sides disagreed."""
+
+    def __init__(self, step, op, args, kind, reference, candidate):
+        self.step = step
+        self.op = op
+        self.args = args
+        self.kind = kind                # 'result' or 'state'
+        self.reference = reference
+        self.candidate = candidate
+
+    def to_dict(self):
+        return {'step': self.step, 'op': self.op, 'args': list(self.args), 'kind': self.kind,
+                'reference': repr(self.reference), 'candidate': repr(self.candidate)}
+
+    def __repr__(self):
+        return (f"step {self.step}: {self.op}{tuple(self.args)} {self.kind} differs\n"
+                f"  reference: {self.reference!r}\n  candidate: {self.candidate!r}")
+
+
+class Timings:
+    """Per-side, per-op call count and total seconds."""
+
+    def __init__(self):
+        self.stats = {'reference': {}, 'candidate': {}}
+
+    def record(self, side, op, seconds):
+        entry = self.stats[side].setdefault(op, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def merge(self, other):
+        for side, ops in other.stats.items():
+            for op, (count, total) in ops.items():
+                entry = self.stats[side].setdefault(op, [0, 0.0])
+                entry[0] += count
+                entry[1] += total
+
+    def summary(self):
+        rows = {}
+        for op in sorted(set(self.stats['reference']) | set(self.stats['candidate'])):
+            ref = self.stats['reference'].get(op, [0, 0.0])
+            cand = self.stats['candidate'].get(op, [0, 0.0])
+            rows[op] = {
+                'count': ref[0],
+                'reference_us': round(ref[1] / ref[0] * 1e6, 2) if ref[0] else None,
+                'candidate_us': round(cand[1] / cand[0] * 1e6, 2) if cand[0] else None,
+                'speedup': round(ref[1] / cand[1], 2) if ref[1] and cand[1] else None,
+            }
+        return rows
+
+
+def _call(side, op, args, timings, label):
+    start = time.perf_counter()
+    try:
+        outcome = ('ok', getattr(side, op)(*args))
+    except Exception as e:
+        outcome = ('error', type(e).__name__)
+    if timings is not None:
+        timings.record(label, op, time.perf_counter() - start)
+    return outcome
+
+
+def _step(reference, candidate, step, op, args, timings):
+    ref_outcome = _call(reference, op, args, timings, 'reference')
+    cand_outcome = _call(candidate, op, args, timings, 'candidate')
+    if ref_outcome != cand_outcome:
+        return Mismatch(step, op, args, 'result', ref_outcome, cand_outcome)
+    ref_state, cand_state = reference.observe(), candidate.observe()
+    if ref_state != cand_state:
+        return Mismatch(step, op, args, 'state', ref_state, cand_state)
+    return None
+
+
+def run_sequence(scenario, ops, timings=None):
+    """
+    Replays a fixed list of (op, args) on fresh sides. Returns the first Mismatch or None.
+    Time Complexity: O(sum of operation costs on both sides)
+    """
+    reference, candidate = scenario.make_reference(), scenario.make_candidate()
+    try:
+        with contextlib.redirect_stdout(_Discard()):
+            for step, (op, args) in enumerate(ops):
+                mismatch = _step(reference, candidate, step, op, args, timings)
+                if mismatch:
+                    return mismatch
+        return None
+    finally:
+        reference.close()
+        candidate.close()
+
+
+def shrink_sequence(scenario, ops, max_runs=2000):
+    """
+    Delta-debugging style shrink: removes ever smaller chunks of a failing
+    sequence while it keeps failing.
+    Time Complexity: O(n^2) replays in the worst case (bounded by max_runs)
+    """
+    runs = 0
+    chunk = max(1, len(ops) // 2)
+    while runs < max_runs:
+        reduced = False
+        step = chunk if chunk > 4 else 1    # Small chunks try every offset (catches op pairs that cancel out)
+        i = 0
+        while i < len(ops) and runs < max_runs:
+            trial = ops[:i] + ops[i + chunk:]
+            runs += 1
+            if trial and run_sequence(scenario, trial):
+                ops = trial
+                reduced = True
+            else:
+                i += step
+        if chunk == 1 and not reduced:
+            break
+        if not reduced:
+            chunk = chunk // 2 if chunk > 4 else chunk - 1
+    return ops
+
+
+class FuzzResult:
+    def __init__(self, scenario, seed, ops, mismatch, timings):
+        self.scenario = scenario
+        self.seed = seed
+        self.ops = ops                  # Shrunk reproduction when mismatch is set
+        self.mismatch = mismatch
+        self.timings = timings
+
+    @property
+    def ok(self):
+        return self.mismatch is None
+
+    def to_dict(self):
+        data = {'scenario': self.scenario, 'seed': self.seed, 'ok': self.ok,
+                'timings': self.timings.summary()}
+        if self.mismatch:
+            data['mismatch'] = self.mismatch.to_dict()
+            data['reproduction'] = [[op, list(args)] for op, args in self.ops]
+        return data
+
+
+def _check(scenario, ops, mismatch, seed, timings, shrink):
+    if mismatch and shrink:
+        ops = shrink_sequence(scenario, ops[:mismatch.step + 1])
+        mismatch = run_sequence(scenario, ops)
+    return FuzzResult(scenario.name, seed, ops, mismatch, timings)
+
+
+def fuzz(scenario, seed=0, steps=1000, mix=None, shrink=True):
+    """
+    Runs `steps` random operations drawn from `mix` (op -> weight, defaults to the
+    scenario's own) on both sides in lockstep. Arguments are generated from the
+    reference side's current state.
+    Time Complexity: O(steps * op cost), plus shrinking on failure
+    """
+    mix = {op: w for op, w in (mix or scenario.mix).items() if op in scenario.mix and w > 0}
+    if not mix:
+        raise ValueError(f"Mix shares no operations with scenario '{scenario.name}'")
+    names, weights = list(mix), list(mix.values())
+    rng = random.Random(seed)
+    timings = Timings()
+    reference, candidate = scenario.make_reference(), scenario.make_candidate()
+    ops, mismatch = [], None
+    try:
+        with contextlib.redirect_stdout(_Discard()):
+            for step in range(steps):
+                op = rng.choices(names, weights)[0]
+                args = scenario.generate(op, rng, reference)
+                ops.append((op, args))
+                mismatch = _step(reference, candidate, step, op, args, timings)
+                if mismatch:
+                    break
+    finally:
+        reference.close()
+        candidate.close()
+    return _check(scenario, ops, mismatch, seed, timings, shrink)
+
+
+def replay(scenario, ops, shrink=True):
+    """
+    Runs a captured command sequence verbatim; ops the scenario does not know are skipped.
+    """
+    ops = [(op, args) for op, args in ops if op in scenario.mix and args is not None]
+    timings = Timings()
+    mismatch = run_sequence(scenario, ops, timings)
+    return _check(scenario, ops, mismatch, None, timings, shrink)
+
+
+def load_workload(lines):
+    """
+    Reads a cli_runner batch script (shell-style or JSON commands) or the JSONL it
+    produced, returning [(op, args)]. Output records carry no arguments (args is None),
+    so they are only good for operation mixes.
+    """
+    ops = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('{'):
+            record = json.loads(stripped)
+            if 'summary' in record:
+                continue
+            if 'ok' in record:
+                if record.get('op'):
+                    ops.append((record['op'], None))
+                continue
+        parsed = parse_command(line)
+        if parsed is None:
+            continue
+        op, args = parsed
+        converters = BATCH_COMMANDS[op][2]
+        ops.append((op, tuple(convert(arg) for convert, arg in zip(converters, args))))
+    return ops
+
+
+def mix_from_workload(ops):
+    return dict(Counter(op for op, _ in ops))
+
+
+def format_result(result):
+    lines = [f"{result.scenario} (seed {result.seed}): "
+             + ("OK" if result.ok else "MISMATCH")]
+    lines.append(f"  {'op':<10} {'count':>7} {'reference us':>13} {'candidate us':>13} {'speedup':>8}")
+    for op, row in result.timings.summary().items():
+        fmt = lambda v: "-" if v is None else f"{v:,.1f}"
+        lines.append(f"  {op:<10} {row['count']:>7,} {fmt(row['reference_us']):>13} "
+                     f"{fmt(row['candidate_us']):>13} {fmt(row['speedup']):>8}")
+    if not result.ok:
+        lines.append(f"  {result.mismatch!r}".replace("\n", "\n  "))
+        lines.append(f"  reproduction ({len(result.ops)} ops):")
+        lines.extend(f"    {op} {' '.join(map(repr, args))}" for op, args in result.ops)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PlayWise differential fuzzer")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append',
+                        help="scenario to run (repeatable; default: all)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--runs', type=int, default=1, help="seeds seed..seed+runs-1")
+    parser.add_argument('--workload', metavar='FILE', help="captured batch script or JSONL output")
+    parser.add_argument('--replay', action='store_true', help="run the workload verbatim")
+    parser.add_argument('--json', action='store_true', help="print one JSON result per line")
+    args = parser.parse_args()
+
+    workload = None
+    if args.workload:
+        with open(args.workload, encoding='utf-8') as f:
+            workload = load_workload(f)
+
+    failed = False
+    for name in args.scenario or sorted(SCENARIOS):
+        scenario = SCENARIOS[name]()
+        if workload is not None and not set(mix_from_workload(workload)) & set(scenario.mix):
+            print(f"{name}: workload has no operations for this scenario, skipped", file=sys.stderr)
+            continue
+        if args.replay and workload is not None:
+            results = [replay(scenario, workload)]
+        else:
+            mix = mix_from_workload(workload) if workload is not None else None
+            results = [fuzz(scenario, seed, args.steps, mix)
+                       for seed in range(args.seed, args.seed + args.runs)]
+        combined = Timings()
+        for result in results:
+            combined.merge(result.timings)
+            failed |= not result.ok
+            if args.json:
+                print(json.dumps(result.to_dict()))
+            elif not result.ok:
+                print(format_result(result))
+        if not args.json and all(result.ok for result in results):
+            print(format_result(FuzzResult(name, f"{args.seed}..{args.seed + len(results) - 1}",
+                                           [], None, combined)))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# File: specialized/co_listen_graph.py
+
+import heapq
+
+
+class CoListenGraph:
+    """
+    Incremental co-listen model built from consecutive plays (A -> B transitions).
+    Each song keeps a bounded neighbor list; when it is full the weakest neighbor is
+    replaced (Space-Saving style, the newcomer inherits its weight) so memory stays
+    O(songs * max_neighbors) while frequent transitions survive.
+    """
+
+    def __init__(self, max_neighbors=32, max_edges=None, prune_to=0.75):
+        self.max_neighbors = max_neighbors
+        self.max_edges = max_edges            # Global edge budget enforced by prune()
+        self.prune_to = prune_to              # Automatic prunes go down to this fraction of max_edges
+        self.prune_passes = 0                 # Number of prune() calls so far
+        self.transitions = {}                 # Maps song_id to {next_song_id: weight}
+        self.co_listens = {}                  # Undirected version used for similarity
+        self.best_next = {}                   # Maps song_id to (next_song_id, weight)
+        self.edge_count = 0                   # Edges across both adjacency maps
+        self.last_song_id = None              # Carries the chain across streamed batches
+        self._history_seen = 0                # Last PlaybackHistory play sequence ingested
+
+    def _bump(self, adjacency, a, b, best=None):
+        neighbors = adjacency.get(a)
+        if neighbors is None:
+            neighbors = adjacency[a] = {}
+        weight = neighbors.get(b)
+        if weight is not None:
+            weight += 1
+        elif len(neighbors) < self.max_neighbors:
+            weight = 1
+            self.edge_count += 1
+        else:
+            weakest = min(neighbors, key=neighbors.get)
+            weight = neighbors.pop(weakest) + 1
+            if best is not None and best.get(a, (None,))[0] == weakest:
+                best[a] = (b, weight)
+        neighbors[b] = weight
+        if best is not None:
+            current = best.get(a)
+            if current is None or weight > current[1] or current[0] == b:
+                best[a] = (b, weight)
+
+    def add_transition(self, from_id, to_id):
+        """
+        Records one A -> B transition.
+        Time Complexity: O(1), O(max_neighbors) when a full neighbor list evicts
+        """
+        if from_id == to_id:
+            return
+        self._bump(self.transitions, from_id, to_id, self.best_next)
+        self._bump(self.co_listens, from_id, to_id)
+        self._bump(self.co_listens, to_id, from_id)
+        if self.max_edges is not None and self.edge_count > self.max_edges:
+            self.prune()
+
+    def ingest(self, song_ids):
+        """
+        Streams a batch of song_ids in play order, continuing from the previous batch.
+        Time Complexity: O(b) for a batch of b plays
+        """
+        previous = self.last_song_id
+        for song_id in song_ids:
+            if previous is not None:
+                self.add_transition(previous, song_id)
+            previous = song_id
+        self.last_song_id = previous
+
+    def ingest_history(self, playback_history):
+        """
+        Ingests plays added to a PlaybackHistory since the last call, tracked by play
+        sequence number so undo-then-play between calls is not missed.
+        Undone plays that were already ingested are kept.
+        Time Complexity: O(new plays)
+        """
+        fresh = playback_history.plays_since(self._history_seen)
+        self.ingest(song.song_id for song in fresh)
+        self._history_seen = playback_history.play_sequence
+
+    def next_song(self, song_id):
+        """
+        Most frequent follower of a song, or None.
+        Time Complexity: O(1)
+        """
+        best = self.best_next.get(song_id)
+        return best[0] if best else None
+
+    def top_k_next(self, song_id, k=5):
+        """
+        Returns [(song_id, weight)] of the k most frequent followers.
+        Time Complexity: O(m log k) with m <= max_neighbors
+        """
+        neighbors = self.transitions.get(song_id, {})
+        return heapq.nlargest(k, neighbors.items(), key=lambda item: item[1])
+
+    def similar_songs(self, song_id, k=5):
+        """
+        Returns [(song_id, weight)] of songs most often played next to this one (either order).
+        Time Complexity: O(m log k)
+        """
+        neighbors = self.co_listens.get(song_id, {})
+        return heapq.nlargest(k, neighbors.items(), key=lambda item: item[1])
+
+    def prune(self, min_weight=None):
+        """
+        Drops low-weight edges. Without min_weight the threshold starts at 2 and
+        rises until the edge count is at most prune_to * max_edges; the headroom
+        below the budget keeps a stream sitting at the budget from rescanning
+        every graph on each new edge.
+        Time Complexity: O(E) per pass, amortized over the edges added in between
+        """
+        self.prune_passes += 1
+        threshold = 2 if min_weight is None else min_weight
+        low_water = None if self.max_edges is None else int(self.max_edges * self.prune_to)
+        while True:
+            self._drop_below(threshold)
+            if min_weight is not None or low_water is None or self.edge_count <= low_water:
+                return
+            threshold *= 2
+
+    def _drop_below(self, threshold):
+        for adjacency, best in ((self.transitions, self.best_next), (self.co_listens, None)):
+            for song_id in list(adjacency):
+                neighbors = adjacency[song_id]
+                weak = [n for n, w in neighbors.items() if w < threshold]
+                if not weak:
+                    continue
+                for n in weak:
+                    del neighbors[n]
+                self.edge_count -= len(weak)
+                if not neighbors:
+                    del adjacency[song_id]
+                if best is not None:
+                    if neighbors:
+                        best[song_id] = max(neighbors.items(), key=lambda item: item[1])
+                    else:
+                        best.pop(song_id, None)
@@ -0,0 +1,166 @@
+# File: specialized/duration_playlist_builder.py
+
+import heapq
+
+from core.playlist_engine import PlaylistEngine
+
+
+class DurationPlaylistBuilder:
+    """
+    Picks songs whose total duration lands within tolerance of a target while
+    maximizing a per-song score (0/1 knapsack).
+    Small instances use DP over bucketed durations; when the DP would be too large
+    a greedy pass by score density is used instead. Either result is then polished
+    by swap-based local search.
+    """
+
+    def __init__(self, score_fn=None, max_cells=256, dp_budget=400_000,
+                 swap_candidates=200, max_swaps=1000):
+        self.score_fn = score_fn or (lambda song: 1)   # Default: as many songs as fit
+        self.max_cells = max_cells          # Duration buckets in the DP table
+        self.dp_budget = dp_budget          # Max (candidates x cells) before falling back to greedy
+        self.swap_candidates = swap_candidates   # Left-out songs considered by local search
+        self.max_swaps = max_swaps
+        self.last_method = None             # 'dp' or 'greedy' for the last call
+        self.last_in_range = None           # Whether the last selection landed within tolerance
+
+    def select(self, source, target_seconds, tolerance=60):
+        """
+        Returns a list of songs with target - tolerance <= total <= target + tolerance
+        (best effort if no such subset exists), maximizing total score.
+        `source` is a PlaylistEngine or any iterable of Song objects.
+        Time Complexity: O(n) scan + O(m * C) DP on m reduced candidates and C cells
+        Space Complexity: O(m + C)
+        """
+        low, high = target_seconds - tolerance, target_seconds + tolerance
+        songs = source.display_playlist() if hasattr(source, 'display_playlist') else source
+        bucket = max(1, high // self.max_cells)
+        capacity = high // bucket + 2       # Slack absorbs bucket rounding
+
+        # Songs are grouped by bucketed duration. Rounding can undercount a song's real
+        # length, so the number kept per group is bounded by how many of the group's
+        # shortest songs really fit (high // min duration), ranked by score density
+        groups = {}
+        half = bucket // 2
+        for song in songs:
+            duration = song.duration
+            if 0 < duration <= high:
+                w = (duration + half) // bucket or 1
+                group = groups.get(w)
+                if group is None:
+                    groups[w] = [song]
+                else:
+                    group.append(song)
+        score_fn = self.score_fn
+        candidates = []
+        for w, group in groups.items():
+            keep = high // min(song.duration for song in group)
+            if len(group) > keep:
+                group = heapq.nlargest(keep, group, key=lambda song: score_fn(song) / song.duration)
+            candidates.extend((score_fn(song), song.duration, song, w) for song in group)
+
+        chosen = None
+        if len(candidates) * capacity <= self.dp_budget:
+            chosen = self._dp(candidates, capacity, low, high)
+            self.last_method = 'dp'
+        if chosen is not None:
+            chosen = self._polish(chosen, candidates, low, high)
+        if chosen is None or not low <= sum(item[1] for item in chosen) <= high:
+            greedy = self._polish(self._greedy(candidates, high), candidates, low, high)
+            if chosen is None or self._miss(greedy, low, high) < self._miss(chosen, low, high):
+                chosen = greedy
+                self.last_method = 'greedy'
+        self.last_in_range = self._miss(chosen, low, high) == 0
+        return [item[2] for item in chosen]
+
+    @staticmethod
+    def _miss(chosen, low, high):
+        # Seconds by which a selection misses the [low, high] window (0 = in range)
+        total = sum(item[1] for item in chosen)
+        return max(low - total, total - high, 0)
+
+    def _polish(self, chosen, candidates, low, high):
+        picked = set(map(id, chosen))
+        rest = [item for item in candidates if id(item) not in picked]
+        return self._local_search(list(chosen), rest, low, high)
+
+    def build_playlist(self, source, target_seconds, tolerance=60):
+        """
+        Same as select() but returns a new PlaylistEngine.
+        """
+        playlist = PlaylistEngine()
+        for song in self.select(source, target_seconds, tolerance):
+            playlist.append_song(song)
+        return playlist
+
+    def _dp(self, candidates, capacity, low, high):
+        # dp[c] = (score, exact seconds, chain) for the best subset of bucketed weight c;
+        # chain is a persistent linked list (song, rest) so no 2D table is needed
+        dp = [None] * (capacity + 1)
+        dp[0] = (0, 0, None)
+        for item in candidates:
+            score, duration, _, w = item
+            for c in range(capacity, w - 1, -1):
+                prev = dp[c - w]
+                if prev is None:
+                    continue
+                total = prev[1] + duration
+                if total > high:
+                    continue
+                new_score = prev[0] + score
+                current = dp[c]
+                if current is None or new_score > current[0]:
+                    dp[c] = (new_score, total, (item, prev[2]))
+        best = None
+        for state in dp:
+            if state is not None and low <= state[1] <= high:
+                if best is None or state[0] > best[0]:
+                    best = state
+        if best is None:
+            return None
+        result = []
+        chain = best[2]
+        while chain:
+            result.append(chain[0])
+            chain = chain[1]
+        result.reverse()
+        return result
+
+    @staticmethod
+    def _greedy(candidates, high):
+        chosen = []
+        total = 0
+        for item in sorted(candidates, key=lambda item: item[0] / item[1], reverse=True):
+            if total + item[1] <= high:
+                chosen.append(item)
+                total += item[1]
+        return chosen
+
+    def _local_search(self, chosen, rest, low, high):
+        # Swap one chosen song for one left-out song. Below range, a swap must raise
+        # the total without overshooting; in range, it must raise the score.
+        total = sum(item[1] for item in chosen)
+        pool = heapq.nlargest(self.swap_candidates, rest, key=lambda item: item[0])
+        for _ in range(self.max_swaps):
+            swap = self._find_swap(chosen, pool, total, low, high)
+            if swap is None:
+                break
+            i, j = swap
+            total += pool[j][1] - chosen[i][1]
+            chosen[i], pool[j] = pool[j], chosen[i]
+        return chosen
+
+    @staticmethod
+    def _find_swap(chosen, pool, total, low, high):
+        in_range = low <= total
+        for i, out in enumerate(chosen):
+            for j, inc in enumerate(pool):
+                new_total = total - out[1] + inc[1]
+                if new_total > high:
+                    continue
+                if in_range:
+                    if new_total >= low and inc[0] > out[0]:
+                        return i, j
+                elif new_total > total:
+                    return i, j
+        return None
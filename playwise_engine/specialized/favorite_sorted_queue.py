@@ -7,6 +7,7 @@ class FavoriteSortedQueue:
         # Max-heap: use negative duration
         self.listen_heap = []  # Each entry: (-total_time_listened, song_id, song)
         self.song_map = {}     # Maps song_id to (total_time_listened, song)
+        self.version = 0       # Bumped on every mutation (used by snapshot caching)
 
     def add_listen_time(self, song, seconds):
         """
@@ -22,6 +23,7 @@ class FavoriteSortedQueue:
 
         self.song_map[song.song_id] = (total_time, song)
         heapq.heappush(self.listen_heap, (-total_time, song.song_id, song))
+        self.version += 1
 
     def get_top_k_songs(self, k=5):
         """
@@ -0,0 +1,255 @@
+# File: specialized/sharded_listen_aggregator.py
+
+import heapq
+import zlib
+from array import array
+from collections import deque
+from multiprocessing import Pipe, Process
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7: fall back to sending raw bytes over the pipe
+    shared_memory = None
+
+SLOTS_PER_SHARD = 2    # Double buffering: fill one slot while the worker drains the other
+
+
+def shard_for(song_id, num_shards):
+    """
+    Stable shard assignment for a song (same result in every process).
+    Time Complexity: O(len(song_id))
+    """
+    return zlib.crc32(str(song_id).encode("utf-8")) % num_shards
+
+
+def _shard_worker(conn, segments):
+    """
+    Worker loop owning one shard: total listen seconds and play count per song index.
+    Batches arrive as [ids..., seconds...] uint32 blocks in shared memory.
+    """
+    listen_time = {}
+    play_count = {}
+    while True:
+        message = conn.recv()
+        op = message[0]
+        if op == "batch":
+            _, slot, count, payload = message
+            raw = segments[slot].buf[:count * 8] if payload is None else memoryview(payload)
+            view = raw.cast("I")
+            for idx, seconds in zip(view[:count], view[count:]):
+                listen_time[idx] = listen_time.get(idx, 0) + seconds
+                play_count[idx] = play_count.get(idx, 0) + 1
+            view.release()
+            raw.release()
+            conn.send(("ack", slot))
+        elif op == "top":
+            conn.send(heapq.nlargest(message[1], listen_time.items(), key=lambda item: item[1]))
+        elif op == "stats":
+            idx = message[1]
+            conn.send((listen_time.get(idx, 0), play_count.get(idx, 0)))
+        elif op == "stop":
+            break
+    for segment in segments:
+        segment.close()
+    conn.close()
+
+
+class ShardedListenAggregator:
+    """
+    Multi-process counterpart of FavoriteSortedQueue for bulk listen-event ingestion.
+    Events are partitioned by song_id hash across worker processes; each worker
+    aggregates its own shard and per-shard top-k lists are merged into a global ranking.
+    """
+
+    def __init__(self, num_shards=2, batch_size=65536, merge_every=None, ranking_size=10):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.num_shards = num_shards
+        self.batch_size = batch_size
+        self.merge_every = merge_every        # Events between automatic ranking merges (None = manual)
+        self.ranking_size = ranking_size
+        self.ranking = []                     # Last merged global ranking: [(song, total_seconds)]
+        self.songs = []                       # Maps song index to Song
+        self.song_index = {}                  # Maps song_id to song index
+        self.shard_of = []                    # Maps song index to shard
+        self._events_since_merge = 0
+        self._ids = [array("I") for _ in range(num_shards)]
+        self._seconds = [array("I") for _ in range(num_shards)]
+        self._in_flight = [deque() for _ in range(num_shards)]
+        self._segments = []
+        self._conns = []
+        self._workers = []
+        self._start_workers()
+
+    def _start_workers(self):
+        for _ in range(self.num_shards):
+            segments = []
+            if shared_memory is not None:
+                segments = [shared_memory.SharedMemory(create=True, size=self.batch_size * 8)
+                            for _ in range(SLOTS_PER_SHARD)]
+            parent_conn, child_conn = Pipe()
+            worker = Process(target=_shard_worker, args=(child_conn, segments), daemon=True)
+            worker.start()
+            child_conn.close()
+            self._segments.append(segments)
+            self._conns.append(parent_conn)
+            self._workers.append(worker)
+
+    def register_song(self, song):
+        """
+        Interns a song and returns its index; events travel between processes as indices.
+        Time Complexity: O(1)
+        """
+        idx = self.song_index.get(song.song_id)
+        if idx is None:
+            idx = len(self.songs)
+            self.songs.append(song)
+            self.song_index[song.song_id] = idx
+            self.shard_of.append(shard_for(song.song_id, self.num_shards))
+        return idx
+
+    def add_listen_time(self, song, seconds):
+        """
+        Buffers one listen event; full shard buffers are shipped to their worker.
+        Time Complexity: O(1) amortized
+        Space Complexity: O(batch_size) per shard
+        """
+        idx = self.song_index.get(song.song_id)
+        if idx is None:
+            idx = self.register_song(song)
+        shard = self.shard_of[idx]
+        self._ids[shard].append(idx)
+        self._seconds[shard].append(seconds)
+        if len(self._ids[shard]) >= self.batch_size:
+            self._send(shard)
+        self._events_since_merge += 1
+        if self.merge_every and self._events_since_merge >= self.merge_every:
+            self.merge_rankings()
+
+    def add_encoded_events(self, indices, seconds):
+        """
+        Bulk ingestion of a pre-interned event log (parallel sequences of song
+        indices from register_song and listen seconds).
+        Time Complexity: O(e) routing in this process, aggregation spread over workers
+        """
+        self._send_all()
+        shard_of = self.shard_of
+        id_appends = [ids.append for ids in self._ids]
+        second_appends = [secs.append for secs in self._seconds]
+        for start in range(0, len(indices), self.batch_size):
+            stop = start + self.batch_size
+            for idx, secs in zip(indices[start:stop], seconds[start:stop]):
+                shard = shard_of[idx]
+                id_appends[shard](idx)
+                second_appends[shard](secs)
+            self._send_all()
+        self._events_since_merge += len(indices)
+        if self.merge_every and self._events_since_merge >= self.merge_every:
+            self.merge_rankings()
+
+    def _send(self, shard):
+        ids = self._ids[shard]
+        count = len(ids)
+        if not count:
+            return
+        conn = self._conns[shard]
+        in_flight = self._in_flight[shard]
+        if self._segments[shard]:
+            if len(in_flight) == SLOTS_PER_SHARD:
+                self._wait_ack(shard)
+            slot = next(s for s in range(SLOTS_PER_SHARD) if s not in in_flight)
+            nbytes = count * ids.itemsize
+            buf = self._segments[shard][slot].buf
+            buf[:nbytes] = memoryview(ids).cast("B")
+            buf[nbytes:2 * nbytes] = memoryview(self._seconds[shard]).cast("B")
+            conn.send(("batch", slot, count, None))
+        else:
+            slot = None
+            conn.send(("batch", slot, count, ids.tobytes() + self._seconds[shard].tobytes()))
+        in_flight.append(slot)
+        # Cleared in place (the bytes were already copied out) so bound .append
+        # methods held by add_encoded_events stay valid
+        del ids[:]
+        del self._seconds[shard][:]
+
+    def _send_all(self):
+        for shard in range(self.num_shards):
+            self._send(shard)
+
+    def _wait_ack(self, shard):
+        self._conns[shard].recv()
+        self._in_flight[shard].popleft()
+
+    def flush(self):
+        """
+        Ships all buffered events and waits until every worker has applied them.
+        """
+        self._send_all()
+        for shard in range(self.num_shards):
+            while self._in_flight[shard]:
+                self._wait_ack(shard)
+
+    def merge_rankings(self, k=None):
+        """
+        Merges per-shard top-k lists into the global ranking.
+        Each song lives in exactly one shard, so the union of shard top-k lists
+        always contains the global top-k.
+        Time Complexity: O(s * k log k) for s shards
+        """
+        k = self.ranking_size if k is None else k
+        self.flush()
+        for conn in self._conns:
+            conn.send(("top", k))
+        candidates = []
+        for conn in self._conns:
+            candidates.extend(conn.recv())
+        top = heapq.nlargest(k, candidates, key=lambda item: item[1])
+        self.ranking = [(self.songs[idx], total) for idx, total in top]
+        self._events_since_merge = 0
+        return self.ranking
+
+    def get_top_k_songs(self, k=5):
+        """
+        Returns top k most-listened songs across all shards.
+        Time Complexity: O(s * k log k)
+        """
+        return [song for song, _ in self.merge_rankings(k)]
+
+    def get_listen_stats(self, song_id):
+        """
+        Returns (total seconds listened, play count) for a song.
+        """
+        idx = self.song_index.get(song_id)
+        if idx is None:
+            return (0, 0)
+        self.flush()
+        conn = self._conns[self.shard_of[idx]]
+        conn.send(("stats", idx))
+        return conn.recv()
+
+    def close(self):
+        """
+        Drains pending events, stops the workers and releases shared memory.
+        """
+        if not self._workers:
+            return
+        self.flush()
+        for conn in self._conns:
+            conn.send(("stop",))
+        for worker in self._workers:
+            worker.join()
+        for conn in self._conns:
+            conn.close()
+        for segments in self._segments:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+        self._workers = []
+        self._conns = []
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
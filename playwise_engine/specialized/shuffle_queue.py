@@ -0,0 +1,270 @@
+# File: specialized/shuffle_queue.py
+
+import math
+import random
+from collections import deque
+
+WEIGHT_SCALE = 1000    # Weights are stored as scaled ints so the Fenwick sums stay exact
+
+
+class UniformSampler:
+    """
+    Lazy Fisher–Yates: draws positions 0..n-1 without repetition, storing only
+    the positions displaced so far instead of a shuffled copy.
+    """
+
+    def __init__(self, n, rng):
+        self.n = n
+        self.drawn = 0
+        self.swaps = {}        # Virtual array overrides: position -> index
+        self.rng = rng
+
+    def __len__(self):
+        return self.n - self.drawn
+
+    def draw(self):
+        """
+        Time Complexity: O(1)
+        Space Complexity: O(1) per draw
+        """
+        if self.drawn >= self.n:
+            return None
+        j = self.rng.randrange(self.drawn, self.n)
+        picked = self.swaps.get(j, j)
+        head = self.swaps.pop(self.drawn, self.drawn)
+        if j != self.drawn:
+            self.swaps[j] = head
+        self.drawn += 1
+        return picked
+
+    def reinsert(self, idx):
+        """
+        Returns a drawn index to the pool.
+        Time Complexity: O(1)
+        """
+        self.drawn -= 1
+        self.swaps[self.drawn] = idx
+
+
+class FenwickSampler:
+    """
+    Weighted sampling without replacement over a Fenwick (binary indexed) tree.
+    Draws, removals and weight updates are O(log n); weight 0 excludes an index.
+    """
+
+    def __init__(self, weights, rng):
+        self.n = len(weights)
+        self.weights = list(weights)
+        self.live = bytearray(b"\x01") * self.n
+        self.live_count = sum(1 for w in self.weights if w > 0)
+        self.rng = rng
+        tree = [0] * (self.n + 1)
+        for i, w in enumerate(self.weights, 1):    # O(n) bottom-up build
+            tree[i] += w
+            parent = i + (i & -i)
+            if parent <= self.n:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.total = sum(self.weights)
+        self.top_bit = 1 << (self.n.bit_length() - 1) if self.n else 0
+
+    def __len__(self):
+        return self.live_count
+
+    def _add(self, idx, delta):
+        self.total += delta
+        i = idx + 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def _find(self, target):
+        # Smallest index whose prefix sum exceeds target
+        pos = 0
+        bit = self.top_bit
+        tree = self.tree
+        while bit:
+            nxt = pos + bit
+            if nxt <= self.n and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            bit >>= 1
+        return pos
+
+    def draw(self):
+        """
+        Time Complexity: O(log n)
+        """
+        if self.total <= 0:
+            return None
+        idx = self._find(self.rng.randrange(self.total))
+        self.live[idx] = 0
+        self.live_count -= 1
+        self._add(idx, -self.weights[idx])
+        return idx
+
+    def reinsert(self, idx):
+        """
+        Time Complexity: O(log n)
+        """
+        self.live[idx] = 1
+        if self.weights[idx] > 0:
+            self.live_count += 1
+            self._add(idx, self.weights[idx])
+
+    def update(self, idx, weight):
+        """
+        Changes the weight of an index (drawn indices keep the new weight for reinsertion).
+        Time Complexity: O(log n)
+        """
+        old = self.weights[idx]
+        self.weights[idx] = weight
+        if self.live[idx]:
+            self.live_count += (weight > 0) - (old > 0)
+            self._add(idx, weight - old)
+
+
+def rating_listen_weight(rating_tree, favorite_queue=None, rating_weight=1.0, listen_weight=1.0):
+    """
+    Builds a weight function favouring highly rated and much-listened songs:
+    1 + rating_weight * rating + listen_weight * log1p(listen minutes).
+    Ratings are read through an id -> rating index rebuilt whenever
+    rating_tree.version changes, so refresh_weight() after a re-rating sees it.
+    Time Complexity: O(1) per call, plus O(r) once per rating tree change
+    """
+    ratings = {}
+    indexed_version = [None]
+
+    def traverse(node):
+        if not node:
+            return
+        for song in node.songs:
+            ratings[song.song_id] = node.rating
+        traverse(node.left)
+        traverse(node.right)
+
+    listen_map = favorite_queue.song_map if favorite_queue else {}
+
+    def weight(song):
+        if indexed_version[0] != rating_tree.version:
+            ratings.clear()
+            traverse(rating_tree.root)
+            indexed_version[0] = rating_tree.version
+        entry = listen_map.get(song.song_id)
+        minutes = entry[0] / 60 if entry else 0
+        return 1 + rating_weight * ratings.get(song.song_id, 0) + listen_weight * math.log1p(minutes)
+    return weight
+
+
+class ShuffleQueue:
+    """
+    Lazy, non-repeating shuffled play order over a PlaylistEngine.
+    The playlist is indexed once (song references only, nothing is rebuilt); each draw
+    is O(1) uniform or O(log n) weighted. With artist_gap > 0 no artist repeats within
+    the last artist_gap songs whenever the remaining songs make that possible.
+    The order reflects the playlist as of construction; see is_stale().
+    """
+
+    def __init__(self, playlist, weight_fn=None, artist_gap=0, seed=None):
+        self.playlist = playlist
+        self.version = playlist.version
+        self.songs = playlist.display_playlist()
+        self.rng = random.Random(seed)
+        self.weight_fn = weight_fn
+        self.artist_gap = artist_gap
+        self.position = {}     # Maps song_id to index (built lazily for weight updates)
+        if weight_fn is None:
+            self.sampler = UniformSampler(len(self.songs), self.rng)
+        else:
+            self.sampler = FenwickSampler([self._scale(weight_fn(s)) for s in self.songs], self.rng)
+        self.recent_artists = deque()
+        self.blocked = {}      # Maps artist to occurrences in the recent window
+        self.deferred = {}     # Maps blocked artist to indices drawn while blocked
+
+    @staticmethod
+    def _scale(weight):
+        if weight <= 0:
+            return 0
+        return max(1, int(round(weight * WEIGHT_SCALE)))
+
+    def __len__(self):
+        return len(self.sampler) + sum(len(v) for v in self.deferred.values())
+
+    def __iter__(self):
+        while True:
+            song = self.next_song()
+            if song is None:
+                return
+            yield song
+
+    def is_stale(self):
+        """
+        True if the playlist changed since this queue was built.
+        """
+        return self.playlist.version != self.version
+
+    def next_song(self):
+        """
+        Returns the next song in shuffled order, or None when exhausted.
+        Time Complexity: O(1) uniform / O(log n) weighted per draw; a song is drawn again
+        only after its artist leaves the spacing window
+        """
+        # Every blocked draw parks its song in deferred until the artist leaves the
+        # window, so drawing until the sampler is empty is amortized per song
+        while True:
+            idx = self.sampler.draw()
+            if idx is None:
+                break
+            artist = self.songs[idx].artist
+            if artist in self.blocked:
+                self.deferred.setdefault(artist, []).append(idx)
+                continue
+            return self._emit(idx)
+        # Only blocked artists remain: relax spacing for the least recently played one
+        artist = next((a for a in self.recent_artists if a in self.deferred), None)
+        if artist is None:
+            return None
+        pending = self.deferred[artist]
+        idx = pending.pop()
+        if not pending:
+            del self.deferred[artist]
+        return self._emit(idx)
+
+    def _emit(self, idx):
+        song = self.songs[idx]
+        if self.artist_gap > 0:
+            self.recent_artists.append(song.artist)
+            self.blocked[song.artist] = self.blocked.get(song.artist, 0) + 1
+            if len(self.recent_artists) > self.artist_gap:
+                old = self.recent_artists.popleft()
+                self.blocked[old] -= 1
+                if not self.blocked[old]:
+                    del self.blocked[old]
+                    for pending in self.deferred.pop(old, ()):
+                        self.sampler.reinsert(pending)
+        return song
+
+    def update_weight(self, song_id, weight):
+        """
+        Changes a song's weight incrementally (e.g. after a new rating or listen).
+        Time Complexity: O(log n) (plus a one-time O(n) id index)
+        """
+        self.sampler.update(self._index_of(song_id), self._scale(weight))
+
+    def refresh_weight(self, song_id):
+        """
+        Recomputes a song's weight with weight_fn.
+        Time Complexity: O(log n)
+        """
+        idx = self._index_of(song_id)
+        self.sampler.update(idx, self._scale(self.weight_fn(self.songs[idx])))
+
+    def _index_of(self, song_id):
+        if self.weight_fn is None:
+            raise ValueError("Weight updates require a weighted ShuffleQueue")
+        if not self.position:
+            self.position = {song.song_id: i for i, song in enumerate(self.songs)}
+        idx = self.position.get(song_id)
+        if idx is None:
+            raise KeyError(f"Song not in shuffle: {song_id}")
+        return idx
@@ -111,5 +111,446 @@ class PlayWiseTestSuite(unittest.TestCase):
         self.assertIsNotNone(found)
         self.assertLess(end - start, 0.01)  # Should be fast
 
+    def test_sharded_listen_aggregator(self):
+        from specialized.sharded_listen_aggregator import ShardedListenAggregator
+        songs = [Song(str(i), f"Song{i}", "Artist", 100) for i in range(20)]
+        reference = FavoriteSortedQueue()
+        with ShardedListenAggregator(num_shards=3, batch_size=4) as aggregator:
+            for i in range(200):
+                song = songs[(i * 7) % 20]
+                aggregator.add_listen_time(song, int(song.song_id) + 1)
+                reference.add_listen_time(song, int(song.song_id) + 1)
+            top = aggregator.get_top_k_songs(3)
+            self.assertEqual(top, reference.get_top_k_songs(3))
+            total, plays = aggregator.get_listen_stats("0")
+            self.assertEqual(total, reference.song_map["0"][0])
+            self.assertEqual(plays, 10)
+
+    def test_sharded_encoded_events_match_reference(self):
+        from specialized.sharded_listen_aggregator import ShardedListenAggregator
+        songs = [Song(str(i), f"Song{i}", "Artist", 100) for i in range(20)]
+        reference = FavoriteSortedQueue()
+        with ShardedListenAggregator(num_shards=2, batch_size=10) as aggregator:
+            indices = [aggregator.register_song(song) for song in songs]
+            aggregator.add_listen_time(songs[5], 6)     # Already buffered before the bulk call
+            reference.add_listen_time(songs[5], 6)
+            events = [indices[(i * 7) % 20] for i in range(100)]
+            seconds = [int(songs[idx].song_id) + 1 for idx in events]
+            aggregator.add_encoded_events(events, seconds)
+            for idx, secs in zip(events, seconds):
+                reference.add_listen_time(songs[idx], secs)
+            self.assertEqual(aggregator.get_top_k_songs(3), reference.get_top_k_songs(3))
+            for song in songs:
+                total, _ = aggregator.get_listen_stats(song.song_id)
+                self.assertEqual(total, reference.song_map[song.song_id][0])
+            self.assertEqual(aggregator.get_listen_stats("0"), (5, 5))
+
+    def test_song_library_shared_catalog(self):
+        from core.song_library import SongLibrary
+        library = SongLibrary()
+        song = library.intern_song("Hit", "Star", 200)
+        self.assertIs(library.intern_song("Hit", "Star", 200), song)
+        library.intern_song("Other", "Band", 150)
+        for name in ("a", "b", "c"):
+            library.create_playlist(name)
+            library.add_to_playlist(name, song.song_id)
+        library.add_to_playlist("a", "other_band")
+        self.assertFalse(library.add_to_playlist("a", song.song_id))
+        self.assertIs(library.playlists["b"].get_song(0), library.playlists["c"].get_song(0))
+        self.assertEqual(library.playlists_containing(song.song_id), {"a", "b", "c"})
+        self.assertEqual(library.remove_song_everywhere(song.song_id), 3)
+        self.assertEqual(library.playlists_containing(song.song_id), set())
+        self.assertEqual([s.song_id for s in library.playlists["a"].display_playlist()], ["other_band"])
+        self.assertEqual(library.playlists["b"].size, 0)
+
+    def test_snapshot_analytics_matches_python_path(self):
+        from core.snapshot_analytics import SnapshotAnalytics
+        playlist = PlaylistEngine()
+        for i in range(30):
+            playlist.add_song(f"S{i}", f"Artist{i % 4}", 100 + (i * 37) % 250)
+        songs = playlist.display_playlist()
+        history = PlaybackHistory()
+        tree = SongRatingTree()
+        queue = FavoriteSortedQueue()
+        for i, song in enumerate(songs):
+            tree.insert_song(song, i % 5 + 1)
+            if i % 3 == 0:
+                history.play_song(song)
+                queue.add_listen_time(song, i * 10)
+        fast = SnapshotAnalytics(playlist, history, tree, queue).export_snapshot()
+        slow = SnapshotAnalytics(playlist, history, tree, queue, use_numpy=False).export_snapshot()
+        self.assertEqual(fast, slow)
+        self.assertEqual(fast['Total Playtime'], sum(s.duration for s in songs))
+        self.assertEqual(fast['Artist Aggregates']['Artist0']['songs'], 8)
+        self.assertEqual(sum(fast['Playlist Songs by Rating'].values()), 30)
+
+    def test_snapshot_analytics_most_listened_skips_unplayed(self):
+        from core.snapshot_analytics import SnapshotAnalytics
+        playlist = PlaylistEngine()
+        for i in range(5):
+            playlist.add_song(f"S{i}", "X", 100)
+        queue = FavoriteSortedQueue()
+        queue.add_listen_time(playlist.get_song(3), 200)
+        parts = (playlist, PlaybackHistory(), SongRatingTree())
+        expected = [s.title for s in queue.get_top_k_songs(5)]
+        self.assertEqual(expected, ["S3"])
+        for use_numpy in (True, False):
+            analytics = SnapshotAnalytics(*parts, queue, use_numpy=use_numpy)
+            self.assertEqual([s.title for s in analytics.top_k_most_listened(5)], expected)
+        self.assertEqual(SnapshotAnalytics(*parts).export_snapshot()['Top 5 Most Listened'], [])
+
+    def test_snapshot_analytics_ties_at_k(self):
+        from core.snapshot_analytics import SnapshotAnalytics
+        from core.system_snapshot import SystemSnapshot
+        playlist = PlaylistEngine()
+        for i, duration in enumerate([200, 300, 200, 100, 300, 200, 200, 300, 200]):
+            playlist.add_song(f"S{i}", "X", duration)
+        parts = (playlist, PlaybackHistory(), SongRatingTree())
+        expected = [s.title for s in SystemSnapshot(*parts).top_5_longest_songs()]
+        self.assertEqual(expected, ["S1", "S4", "S7", "S0", "S2"])
+        for use_numpy in (True, False):
+            analytics = SnapshotAnalytics(*parts, use_numpy=use_numpy)
+            self.assertEqual([s.title for s in analytics.top_5_longest_songs()], expected)
+
+    def test_snapshot_cache_invalidation(self):
+        from core.system_snapshot import SystemSnapshot
+        playlist = PlaylistEngine()
+        playlist.add_song("A", "X", 100)
+        history = PlaybackHistory()
+        tree = SongRatingTree()
+        snap = SystemSnapshot(playlist, history, tree)
+        first = snap.export_snapshot()
+        self.assertEqual(snap.cache_stats()['misses'], 3)
+        self.assertEqual(snap.export_snapshot(), first)
+        self.assertEqual(snap.cache_stats()['hits'], 3)
+        playlist.add_song("B", "Y", 300)
+        history.play_song(playlist.get_song(1))
+        data = snap.export_snapshot()
+        self.assertEqual(data['Top 5 Longest Songs'][0].title, "B")
+        self.assertEqual(data['Most Recently Played'][-1].title, "B")
+        stats = snap.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (4, 5))
+
+    def test_shuffle_queue(self):
+        from specialized.shuffle_queue import ShuffleQueue, rating_listen_weight
+        playlist = PlaylistEngine()
+        for i in range(40):
+            playlist.add_song(f"S{i}", f"Artist{i % 4}", 100 + i)
+        expected = sorted(s.song_id for s in playlist.display_playlist())
+        uniform = [s.song_id for s in ShuffleQueue(playlist, seed=1)]
+        self.assertEqual(sorted(uniform), expected)
+        self.assertNotEqual(uniform, [s.song_id for s in playlist.display_playlist()])
+
+        tree = SongRatingTree()
+        tree.insert_song(playlist.get_song(0), 5)
+        queue = ShuffleQueue(playlist, weight_fn=rating_listen_weight(tree), artist_gap=3, seed=2)
+        order = list(queue)
+        self.assertEqual(sorted(s.song_id for s in order), expected)
+        for i in range(3, len(order)):
+            self.assertNotIn(order[i].artist, {s.artist for s in order[i - 3:i]})
+
+        queue = ShuffleQueue(playlist, weight_fn=lambda s: 1, seed=3)
+        queue.update_weight("s7_artist3", 0)
+        self.assertNotIn("s7_artist3", [s.song_id for s in queue])
+        playlist.delete_song(0)
+        self.assertTrue(queue.is_stale())
+
+    def test_shuffle_queue_rerating_refreshes_weight(self):
+        from specialized.shuffle_queue import ShuffleQueue, rating_listen_weight
+        playlist = PlaylistEngine()
+        for i in range(5):
+            playlist.add_song(f"S{i}", "X", 100)
+        tree = SongRatingTree()
+        queue = ShuffleQueue(playlist, weight_fn=rating_listen_weight(tree, listen_weight=0), seed=1)
+        song = playlist.get_song(2)
+        self.assertEqual(queue.sampler.weights[2], 1000)
+        tree.insert_song(song, 5)
+        queue.refresh_weight(song.song_id)
+        self.assertEqual(queue.sampler.weights[2], 6000)
+        tree.delete_song(song.song_id)
+        queue.refresh_weight(song.song_id)
+        self.assertEqual(queue.sampler.weights[2], 1000)
+
+    def test_shuffle_queue_skewed_artists(self):
+        from specialized.shuffle_queue import ShuffleQueue
+        playlist = PlaylistEngine()
+        for i in range(300):
+            playlist.add_song(f"Main{i}", "Headliner", 200)
+        for i in range(30):
+            playlist.add_song(f"Other{i}", f"Guest{i % 3}", 200)
+        order = list(ShuffleQueue(playlist, artist_gap=1, seed=4))
+        self.assertEqual(len(order), 330)
+        # Back-to-back repeats are only allowed once every other artist is used up
+        last_other = max(i for i, s in enumerate(order) if s.artist != "Headliner")
+        for i in range(1, last_other):
+            self.assertFalse(order[i].artist == order[i - 1].artist == "Headliner", i)
+
+    def test_co_listen_graph(self):
+        from specialized.co_listen_graph import CoListenGraph
+        graph = CoListenGraph(max_neighbors=2)
+        graph.ingest(["a", "b", "a", "b"])
+        graph.ingest(["a", "c", "a", "d", "a", "d"])
+        self.assertEqual(graph.next_song("a"), "d")
+        self.assertEqual(len(graph.transitions["a"]), 2)
+        self.assertEqual(graph.similar_songs("b", 1), [("a", 4)])
+        history = PlaybackHistory()
+        s1, s2 = Song("x", "X", "A", 100), Song("y", "Y", "B", 100)
+        for song in (s1, s2, s1, s2):
+            history.play_song(song)
+        fresh = CoListenGraph()
+        fresh.ingest_history(history)
+        history.play_song(s1)
+        fresh.ingest_history(history)
+        self.assertEqual(fresh.top_k_next("y", 1), [("x", 2)])
+        fresh.prune(min_weight=2)
+        self.assertEqual(fresh.top_k_next("x"), [("y", 2)])
+        self.assertEqual(fresh.edge_count, 4)
+
+    def test_co_listen_prune_low_water(self):
+        import random
+        from specialized.co_listen_graph import CoListenGraph
+        rng = random.Random(0)
+        graph = CoListenGraph()
+        cycle = [f"s{i}" for i in range(200)]
+        graph.ingest(cycle * 2)                 # Every edge has weight >= 2
+        graph.max_edges = graph.edge_count + 10
+        graph.ingest([f"n{rng.randrange(1000)}" for _ in range(300)])
+        # Without headroom below the budget every few new edges would trigger a full scan
+        self.assertLessEqual(graph.prune_passes, 3)
+        self.assertLessEqual(graph.edge_count, graph.max_edges)
+
+    def test_co_listen_undo_then_play_between_ingests(self):
+        from specialized.co_listen_graph import CoListenGraph
+        a, b, c = (Song(x, x.upper(), "X", 100) for x in "abc")
+        history = PlaybackHistory()
+        graph = CoListenGraph()
+        history.play_song(a)
+        history.play_song(b)
+        graph.ingest_history(history)
+        history.undo_last_play()
+        history.play_song(c)
+        graph.ingest_history(history)
+        self.assertEqual(graph.transitions, {"a": {"b": 1}, "b": {"c": 1}})
+        history.play_song(a)
+        history.undo_last_play()
+        graph.ingest_history(history)       # Played and undone between calls: nothing new
+        self.assertEqual(graph.transitions, {"a": {"b": 1}, "b": {"c": 1}})
+
+    def test_duration_playlist_builder(self):
+        from specialized.duration_playlist_builder import DurationPlaylistBuilder
+        songs = [Song(str(i), f"S{i}", "A", d) for i, d in enumerate([100, 200, 300, 400, 250])]
+        scores = {"0": 1, "1": 5, "2": 4, "3": 6, "4": 2}
+        builder = DurationPlaylistBuilder(score_fn=lambda s: scores[s.song_id])
+        chosen = builder.select(songs, 600, tolerance=0)
+        self.assertEqual(builder.last_method, 'dp')
+        self.assertEqual(sum(s.duration for s in chosen), 600)
+        self.assertEqual(sorted(s.song_id for s in chosen), ["1", "3"])
+        greedy = DurationPlaylistBuilder(score_fn=lambda s: scores[s.song_id], dp_budget=0)
+        playlist = greedy.build_playlist(songs, 700, tolerance=50)
+        total = sum(s.duration for s in playlist.display_playlist())
+        self.assertEqual(greedy.last_method, 'greedy')
+        self.assertTrue(650 <= total <= 750)
+
+    def test_duration_builder_long_target(self):
+        import random
+        from specialized.duration_playlist_builder import DurationPlaylistBuilder
+        rng = random.Random(1)
+        songs = [Song(str(i), f"S{i}", "A", rng.randint(90, 480)) for i in range(5000)]
+        for builder, target in ((DurationPlaylistBuilder(), 86400),
+                                (DurationPlaylistBuilder(max_cells=64), 36000)):
+            total = sum(s.duration for s in builder.select(songs, target, tolerance=60))
+            self.assertTrue(target - 60 <= total <= target + 60, total)
+            self.assertTrue(builder.last_in_range)
+        impossible = DurationPlaylistBuilder()
+        impossible.select(songs[:3], 86400, tolerance=60)
+        self.assertFalse(impossible.last_in_range)
+
+    def test_playlist_journal_undo_redo(self):
+        from core.playlist_journal import PlaylistJournal
+        playlist = PlaylistEngine()
+        journal = PlaylistJournal(playlist)
+        for title, duration in (("C", 300), ("A", 100), ("D", 400), ("B", 200)):
+            journal.add_song(title, "X", duration)
+        titles = lambda: [s.title for s in playlist.display_playlist()]
+        states = [titles()]
+        journal.delete_song(1)
+        states.append(titles())
+        journal.move_song(0, 2)
+        states.append(titles())
+        journal.sort_playlist(key=lambda s: s.duration)
+        states.append(titles())
+        journal.reverse_playlist()
+        states.append(titles())
+        journal.clear_playlist()
+        self.assertEqual(titles(), [])
+        for expected in reversed(states):
+            self.assertTrue(journal.undo())
+            self.assertEqual(titles(), expected)
+            self.assertEqual(playlist.size, len(expected))
+        for expected in states[1:]:
+            self.assertTrue(journal.redo())
+            self.assertEqual(titles(), expected)
+        self.assertTrue(journal.redo())
+        self.assertFalse(journal.redo())
+        playlist.add_song("E", "X", 10)
+        with self.assertRaises(RuntimeError):
+            journal.undo()
+
+    def test_playlist_journal_memory_budget(self):
+        from core.playlist_journal import PlaylistJournal
+        playlist = PlaylistEngine()
+        journal = PlaylistJournal(playlist, max_cost=3)
+        for i in range(5):
+            journal.add_song(f"S{i}", "X", 100)
+        self.assertEqual(len(journal.undo_stack), 3)
+        while journal.undo():
+            pass
+        self.assertEqual([s.title for s in playlist.display_playlist()], ["S0", "S1"])
+
+        journal = PlaylistJournal(PlaylistEngine(), max_cost=50)
+        for _ in range(10):                 # Load-then-clear sessions must stay within budget
+            for i in range(20):
+                journal.add_song(f"S{i}", "X", 100)
+            journal.clear_playlist()
+        self.assertLessEqual(journal.cost, 50)
+
+    def test_journal_clean_is_undoable(self):
+        from cli_runner import PlayWiseSession
+        session = PlayWiseSession()
+        for title, artist in (("A", "X"), ("B", "X"), ("a", "x"), ("C", "Y"), ("b", "X")):
+            session.add(title, artist, 100)
+        self.assertEqual(session.clean(), 2)
+        self.assertEqual([s.title for s in session.show()], ["A", "B", "C"])
+        self.assertTrue(session.undo())
+        self.assertEqual([s.title for s in session.show()], ["A", "B", "a", "C", "b"])
+        self.assertTrue(session.undo())     # Earlier history survives the clean
+        self.assertEqual(len(session.show()), 4)
+        self.assertTrue(session.redo())
+        self.assertTrue(session.redo())
+        self.assertEqual([s.title for s in session.show()], ["A", "B", "C"])
+
+    def test_playlist_diff_and_patch(self):
+        from core.playlist_diff import diff_playlists, apply_patch
+        old, new = PlaylistEngine(), PlaylistEngine()
+        for title in "ABCDEF":
+            old.add_song(title, "X", 100)
+        for title in "BAGCEF":
+            new.add_song(title, "X", 100)
+        script = diff_playlists(old, new)
+        self.assertEqual([op[0] for op in script], ['delete', 'move', 'insert'])
+        apply_patch(old, script)
+        self.assertEqual([s.title for s in old.display_playlist()], list("BAGCEF"))
+        self.assertEqual(old.size, 6)
+
+    def test_playlist_diff_rejects_duplicate_ids(self):
+        from core.playlist_diff import diff_playlists, apply_patch, three_way_merge
+        old, new = PlaylistEngine(), PlaylistEngine()
+        for title, artist in (("A", "X"), ("B", "X"), ("a", "x")):
+            old.add_song(title, artist, 100)
+        for title, artist in (("B", "X"), ("A", "X"), ("a", "x")):
+            new.add_song(title, artist, 100)
+        with self.assertRaises(ValueError):
+            diff_playlists(old, new)
+        with self.assertRaises(ValueError):
+            apply_patch(old, [])
+        with self.assertRaises(ValueError):
+            three_way_merge(old, new, new)
+
+    def test_three_way_merge(self):
+        from core.playlist_diff import merge_into
+        def make(titles):
+            playlist = PlaylistEngine()
+            for title in titles:
+                playlist.add_song(title, "X", 100)
+            return playlist
+        base, ours, theirs = make("ABCDE"), make("ZABDE"), make("ABCEDY")
+        conflicts = merge_into(ours, base, theirs)
+        self.assertEqual([s.title for s in ours.display_playlist()], list("ZABEDY"))
+        self.assertEqual(conflicts, [])
+        conflicts = merge_into(make("BACDE"), make("ABCDE"), make("ACDBE"))
+        self.assertEqual(conflicts, ["b_x"])
+
+    def test_mapped_song_lookup(self):
+        import os
+        import tempfile
+        from core.mapped_song_lookup import MappedSongLookup, build_catalog_index
+        songs = [Song(str(i), f"Title {i}", f"Artist {i % 3}", 100 + i) for i in range(50)]
+        songs.append(Song("7", "Renamed", "Artist", 1))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalog.idx")
+            self.assertEqual(build_catalog_index(songs, path, count=len(songs)), 50)
+            with MappedSongLookup(path, cache_size=4) as lookup:
+                self.assertEqual(len(lookup), 50)
+                found = lookup.get_by_id("42")
+                self.assertEqual((found.title, found.artist, found.duration), ("Title 42", "Artist 0", 142))
+                self.assertEqual(lookup.get_by_title("TITLE 13").song_id, "13")
+                self.assertEqual(lookup.get_by_id("7").title, "Renamed")
+                self.assertIsNone(lookup.get_by_id("missing"))
+                self.assertIsNone(lookup.get_by_title("nope"))
+                lookup.get_by_id("42")
+                self.assertEqual(lookup.cache_hits, 1)
+
+    def test_cli_batch_mode(self):
+        import io
+        import json
+        from cli_runner import run_batch
+        script = [
+            'add "Fix You" Coldplay 295',
+            '# comment',
+            '{"op": "add", "title": "Yellow", "artist": "Coldplay", "duration": 266}',
+            'add Yellow Coldplay 266',
+            'move 1 0',
+            'play 0',
+            'undo',
+            'show',
+            'delete 9',
+            'bogus',
+        ]
+        out = io.StringIO()
+        summary = run_batch(script, out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(records), 10)
+        self.assertIsNone(records[2]["result"])     # Duplicate add
+        self.assertEqual(records[4]["result"]["title"], "Yellow")
+        self.assertEqual([s["title"] for s in records[6]["result"]], ["Fix You", "Yellow"])
+        self.assertFalse(records[7]["ok"])
+        self.assertFalse(records[8]["ok"])
+        self.assertIn("elapsed_us", records[0])
+        self.assertEqual(summary["commands"], 9)
+        self.assertEqual(summary["errors"], 2)
+        self.assertEqual(records[-1]["summary"]["per_op"]["add"]["count"], 3)
+
+    def test_merge_sort_is_stable(self):
+        from core.sorting import merge_sort
+        songs = [Song(str(i), "Same", "X", 100 + i % 2) for i in range(6)]
+        self.assertEqual([s.song_id for s in merge_sort(songs, key=lambda s: s.title)], list("012345"))
+        by_duration = merge_sort(songs, key=lambda s: s.duration, reverse=True)
+        self.assertEqual([s.song_id for s in by_duration], list("135024"))
+
+    def test_differential_fuzz_harness(self):
+        from fuzz_harness import (SCENARIOS, DashboardScenario, PlaylistScenario, JournalPlaylist,
+                                  fuzz, load_workload, mix_from_workload, replay)
+        for name, scenario in SCENARIOS.items():
+            result = fuzz(scenario(), seed=1, steps=150)
+            self.assertTrue(result.ok, f"{name}: {result.mismatch!r}")
+            self.assertGreater(sum(r["count"] for r in result.timings.summary().values()), 0)
+        self.assertTrue(fuzz(DashboardScenario(use_numpy=False), seed=2, steps=150).ok)
+
+        class BrokenJournal(JournalPlaylist):
+            def reverse(self):
+                pass
+        class BrokenScenario(PlaylistScenario):
+            def make_candidate(self):
+                return BrokenJournal()
+        result = fuzz(BrokenScenario(), seed=0, steps=500)
+        self.assertFalse(result.ok)
+        # A no-op reverse records nothing, so the following undo has nothing to revert
+        self.assertEqual([op for op, _ in result.ops], ["reverse", "undo"])
+
+        ops = load_workload(['add "Fix You" Coldplay 295', "move 0 1", '{"op": "top", "ok": true}'])
+        self.assertEqual(ops[0], ("add", ("Fix You", "Coldplay", 295)))
+        self.assertEqual(mix_from_workload(ops), {"add": 1, "move": 1, "top": 1})
+        self.assertTrue(replay(PlaylistScenario(), ops).ok)
+
 if __name__ == "__main__":
     unittest.main()